@@ -2,33 +2,261 @@
 Competitor Monitor Application Package
 """
 from flask import Flask
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from sqlalchemy import event, inspect, text
+from sqlalchemy.pool import NullPool
 import os
+import json
+import hashlib
+import queue
+import atexit
 import logging
+from datetime import date
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from dotenv import load_dotenv
 
-load_dotenv()
+from .database import db
+from .routes import main_bp, api_bp
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+# Hosted environments (Azure App Service, Kubernetes) inject settings directly
+if not (os.environ.get('WEBSITE_SITE_NAME') or os.environ.get('KUBERNETES_SERVICE_HOST')):
+    load_dotenv()
+
+# Configure logging: records go onto an in-process queue and a background
+# listener thread does the blocking stream writes
+_log_handler = QueueHandler(queue.SimpleQueue())
+_log_listener = None
+
+
+def _start_log_listener():
+    """Start this process's listener thread draining the log queue."""
+    global _log_listener
+    _log_listener = QueueListener(_log_handler.queue, logging.StreamHandler(), respect_handler_level=True)
+    _log_listener.start()
+
+
+def _restart_log_listener_after_fork():
+    """Threads don't survive fork (gunicorn --preload), so give the child its own queue and listener."""
+    _log_handler.queue = queue.SimpleQueue()
+    _start_log_listener()
+
+
+def _stop_log_listener():
+    if _log_listener is not None:
+        _log_listener.stop()
+
+
+_start_log_listener()
+os.register_at_fork(after_in_child=_restart_log_listener_after_fork)
+atexit.register(_stop_log_listener)
+logging.basicConfig(level=logging.INFO, handlers=[_log_handler])
 logger = logging.getLogger(__name__)
 
-# Base directory for the project
-BASE_DIR = Path(__file__).resolve().parent.parent
+# Base directory for the project (__file__ is already absolute for package imports)
+BASE_DIR = Path(__file__).parent.parent
 
 # On Azure App Service, use /home for persistent storage
 # Otherwise use local data directory
-if os.path.exists('/home') and os.environ.get('WEBSITE_SITE_NAME'):
+if os.environ.get('WEBSITE_SITE_NAME'):
     DATA_DIR = Path('/home/data')
 else:
     DATA_DIR = BASE_DIR / 'data'
 
 # Ensure data directory exists with parents
-DATA_DIR.mkdir(parents=True, exist_ok=True)
+if not DATA_DIR.is_dir():
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+
 
-# Global scheduler instance
+class Config:
+    """Application settings, read from the environment once at import."""
+    SECRET_KEY = os.getenv('FLASK_SECRET_KEY', 'dev-secret-key')
+    # Use absolute path for SQLite database
+    SQLALCHEMY_DATABASE_URI = os.getenv(
+        'DATABASE_URL',
+        f"sqlite:///{DATA_DIR / 'competitor_monitor.db'}"
+    )
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    
+    _cors_origins = os.getenv('CORS_ORIGINS', '*')
+    CORS_ORIGINS = (
+        '*' if _cors_origins == '*'
+        else tuple(origin.strip() for origin in _cors_origins.split(','))
+    )
+    CORS_MAX_AGE = int(os.getenv('CORS_MAX_AGE', 86400))
+    
+    MONITOR_SCHEDULE_HOURS = int(os.getenv('MONITOR_SCHEDULE_HOURS', 6))
+    NEWS_CHECK_HOURS = int(os.getenv('NEWS_CHECK_HOURS', 6))
+
+
+# Enable CORS for frontend hosted on different domain
+CORS_CONFIG = {
+    r"/api/*": {
+        "origins": Config.CORS_ORIGINS,
+        "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+        "allow_headers": ["Content-Type", "Authorization"],
+        # Let browsers cache preflight responses instead of re-sending OPTIONS
+        "max_age": Config.CORS_MAX_AGE
+    }
+}
+
+
+# Marker written once the schema is known to be complete, so sibling
+# gunicorn workers can skip table reflection on boot
+SCHEMA_SENTINEL = DATA_DIR / '.schema_ok'
+
+# Global scheduler instance and the app its jobs run against
 scheduler = None
+_scheduler_app = None
+
+# Held open for the life of the process that won the scheduler lock
+SCHEDULER_LOCK = DATA_DIR / 'scheduler.lock'
+_scheduler_lock = None
+
+# Collector/analyzer/monitor instances reused across scheduled runs so their
+# HTTP sessions and parsed config survive between ticks
+_job_services = {}
+
+
+def _sqlite_pragmas(dbapi_conn, connection_record):
+    """Tune each new SQLite connection for concurrent reads and cheap commits."""
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA cache_size=-65536")  # 64MB
+    cursor.close()
+
+
+def _unlink_sqlite(db_path):
+    """Delete a SQLite database file along with its WAL and shared-memory files."""
+    for path in (db_path, db_path.with_name(db_path.name + '-wal'), db_path.with_name(db_path.name + '-shm')):
+        path.unlink(missing_ok=True)
+
+
+def _schema_fingerprint(db):
+    """Identify the target database and the declared schema (tables, columns, indexes)."""
+    digest = hashlib.sha256()
+    for table in db.metadata.sorted_tables:
+        digest.update(table.name.encode())
+        for column in table.columns:
+            digest.update(f"{column.name}:{column.type!r}:{column.nullable}".encode())
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            digest.update(index.name.encode())
+    return f"{db.engine.url}\n{digest.hexdigest()}"
+
+
+def _ensure_schema(db):
+    """
+    Create missing tables, columns and indexes.
+    
+    For SQLite the work is skipped when the sentinel records this database
+    file and schema. Server databases can be recreated or repointed behind the
+    same data directory, so they always get the (idempotent) check.
+    """
+    use_sentinel = db.engine.dialect.name == 'sqlite'
+    fingerprint = _schema_fingerprint(db)
+    
+    if use_sentinel and SCHEMA_SENTINEL.exists() and SCHEMA_SENTINEL.read_text() == fingerprint:
+        return
+    
+    db.create_all()
+    
+    # create_all skips tables that already exist, so add nullable columns and
+    # indexes declared since
+    inspector = inspect(db.engine)
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable:
+                    column_type = column.type.compile(dialect=db.engine.dialect)
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                    if column.name == 'competitor_name':
+                        # Rows written before the column existed still need their name
+                        conn.execute(text(
+                            f'UPDATE {table.name} SET competitor_name = '
+                            f'(SELECT name FROM competitors WHERE competitors.id = {table.name}.competitor_id)'
+                        ))
+    
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+    
+    if use_sentinel:
+        SCHEMA_SENTINEL.write_text(fingerprint)
+
+
+def _warm_pool(app, db):
+    """
+    Open and release one connection so the first request doesn't pay for connect/auth.
+    
+    Only pooled server databases (Postgres) benefit; SQLite runs on NullPool,
+    which would just open and discard the connection.
+    """
+    if db.engine.dialect.name == 'sqlite' or isinstance(db.engine.pool, NullPool):
+        return
+    try:
+        with db.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as e:
+        app.logger.warning(f"DB warmup failed: {e}")
+
+
+def dispose_engine(app):
+    """
+    Discard pooled connections inherited across fork().
+    
+    Called from gunicorn's post_fork hook when running with --preload so each
+    worker opens its own connections lazily instead of sharing the parent's sockets.
+    """
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+
+class JSONProvider(DefaultJSONProvider):
+    """
+    Encode API responses with orjson when available.
+    
+    Model to_dict methods return datetimes as-is; both paths write them as
+    ISO 8601 (orjson natively, the stdlib via default).
+    """
+    
+    @staticmethod
+    def default(o):
+        if isinstance(o, date):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+    
+    def dumps(self, obj, **kwargs):
+        if orjson is None:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(
+            obj,
+            default=self.default,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        ).decode('utf-8')
+    
+    def response(self, *args, **kwargs):
+        """Build a jsonify() response from orjson's bytes without a str round trip."""
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(
+            obj,
+            default=self.default,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        )
+        return self._app.response_class(body, mimetype=self.mimetype)
 
 
 def create_app():
@@ -39,34 +267,53 @@ def create_app():
         static_folder='../static'
     )
     
-    # Configuration
-    app.config['SECRET_KEY'] = os.getenv('FLASK_SECRET_KEY', 'dev-secret-key')
+    app.json = JSONProvider(app)
     
-    # Use absolute path for SQLite database
-    db_path = DATA_DIR / 'competitor_monitor.db'
-    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv(
-        'DATABASE_URL', 
-        f'sqlite:///{db_path}'
-    )
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-    
-    # Enable CORS for frontend hosted on different domain
-    cors_origins = os.getenv('CORS_ORIGINS', '*')
-    CORS(app, resources={
-        r"/api/*": {
-            "origins": cors_origins.split(',') if cors_origins != '*' else '*',
-            "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization"]
+    # Configuration
+    app.config.from_object(Config)
+
+    # Connection pool tuning (scheduler threads and HTTP requests share the engine).
+    # SQLite connections are cheap to open and pooled handles to the same file
+    # contend for its lock, so don't pool them at all.
+    uri = app.config['SQLALCHEMY_DATABASE_URI']
+    if uri.startswith('sqlite'):
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            'poolclass': NullPool,
+            'connect_args': {'check_same_thread': False, 'timeout': 30},
         }
-    })
+    else:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            'pool_size': int(os.getenv('DB_POOL_SIZE', 25)),
+            'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 25)),
+            'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', 30)),
+            'pool_pre_ping': True,
+            'pool_recycle': 1800,
+        }
+        # psycopg2 (the default postgresql:// driver) can fold executemany into multi-row INSERTs
+        if uri.startswith(('postgresql://', 'postgresql+psycopg2://', 'postgres://')):
+            app.config['SQLALCHEMY_ENGINE_OPTIONS']['executemany_mode'] = 'values_plus_batch'
+        # Cap statement time so a runaway export query can't hold a pooled connection
+        statement_timeout = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 30000))
+        if uri.startswith(('postgresql', 'postgres://')) and statement_timeout:
+            app.config['SQLALCHEMY_ENGINE_OPTIONS']['connect_args'] = {
+                'options': f'-c statement_timeout={statement_timeout}'
+            }
+    
+    # Room for every distinct ORM/Core statement the app and scheduler compile
+    app.config['SQLALCHEMY_ENGINE_OPTIONS']['query_cache_size'] = int(os.getenv('DB_QUERY_CACHE_SIZE', 2000))
+
+    CORS(app, resources=CORS_CONFIG)
     
     # Initialize database
-    from .database import db
     db.init_app(app)
     
     with app.app_context():
         db_path = DATA_DIR / 'competitor_monitor.db'
         
+        # WAL lets HTTP readers proceed while scheduled jobs write
+        if uri.startswith('sqlite'):
+            event.listen(db.engine, 'connect', _sqlite_pragmas)
+        
         # Ensure data directory exists before any database operations
         DATA_DIR.mkdir(parents=True, exist_ok=True)
         
@@ -76,52 +323,91 @@ def create_app():
         if should_reset and db_path.exists():
             app.logger.warning("RESET_DATABASE flag detected - deleting existing database")
             try:
-                db_path.unlink()
+                _unlink_sqlite(db_path)
+                SCHEMA_SENTINEL.unlink(missing_ok=True)
                 app.logger.info("Database file deleted successfully")
             except Exception as e:
                 app.logger.error(f"Failed to delete database: {e}")
         
-        # Create all tables
-        try:
-            db.create_all()
-            app.logger.info("Database initialized successfully")
-        except Exception as e:
-            error_msg = str(e).lower()
-            app.logger.error(f"Database initialization error: {e}")
-            
-            # If database is corrupted, try to delete and let next restart recreate it
-            if 'malformed' in error_msg or 'corrupt' in error_msg:
-                app.logger.error("Database corrupted - deleting for next restart")
+        # Probe an existing SQLite file for corruption before touching the schema.
+        # Reading the header is cheap; the full quick_check scan only runs if that fails.
+        if uri.startswith('sqlite') and db_path.exists():
+            try:
+                with db.engine.connect() as conn:
+                    conn.exec_driver_sql("PRAGMA schema_version").scalar()
+                check = 'ok'
+            except Exception as e:
+                app.logger.warning(f"Database probe failed, running quick_check: {e}")
                 try:
-                    if db_path.exists():
-                        db_path.unlink()
-                except Exception as e2:
-                    app.logger.error(f"Could not delete corrupted database: {e2}")
+                    with db.engine.connect() as conn:
+                        check = conn.exec_driver_sql("PRAGMA quick_check").scalar()
+                except Exception as e:
+                    check = str(e)
+            
+            if check != 'ok':
+                app.logger.error(f"Database failed quick_check, recreating: {check}")
+                db.engine.dispose()
+                _unlink_sqlite(db_path)
+        
+        # A missing SQLite file invalidates the schema sentinel
+        if uri.startswith('sqlite') and not db_path.exists():
+            SCHEMA_SENTINEL.unlink(missing_ok=True)
+        
+        # Create any missing tables (create_all is idempotent)
+        _ensure_schema(db)
+        app.logger.info("Database initialized successfully")
+        
+        _warm_pool(app, db)
     
     # Register blueprints
-    from .routes import main_bp, api_bp
     app.register_blueprint(main_bp)
     app.register_blueprint(api_bp, url_prefix='/api')
     
     # Register custom Jinja filters
-    import json
-    
     @app.template_filter('from_json')
     def from_json_filter(value):
         """Parse JSON string to Python object."""
-        if not value:
+        if not value or not isinstance(value, (bytes, str)):
             return []
+        # orjson rejects str subclasses such as the Markup that |safe produces
+        if type(value) not in (bytes, str):
+            value = str(value)
         try:
-            return json.loads(value)
-        except (json.JSONDecodeError, TypeError):
+            return _json_loads(value)
+        except (ValueError, TypeError):
             return []
     
-    # Initialize background scheduler for auto-updates
+    # Initialize background scheduler for auto-updates (tests/migrations set DISABLE_SCHEDULER=true)
     init_scheduler(app)
     
     return app
 
 
+def _acquire_scheduler_lock():
+    """
+    Take the scheduler lock without blocking.
+    
+    Every gunicorn worker runs create_app, but APScheduler can't share a job
+    store between schedulers, so only the worker holding this lock starts one.
+    """
+    global _scheduler_lock
+    try:
+        import fcntl
+    except ImportError:
+        # No flock (Windows dev servers run a single process anyway)
+        return True
+    
+    handle = open(SCHEDULER_LOCK, 'w')
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return False
+    
+    _scheduler_lock = handle
+    return True
+
+
 def init_scheduler(app):
     """Initialize APScheduler for background tasks."""
     global scheduler
@@ -133,41 +419,73 @@ def init_scheduler(app):
     
     # Only run scheduler in main worker process (not in reloader subprocess)
     if os.environ.get('WERKZEUG_RUN_MAIN') == 'true' or not app.debug:
+        if not _acquire_scheduler_lock():
+            logger.info("Scheduler already running in another worker process")
+            return
+        
         try:
             from apscheduler.schedulers.background import BackgroundScheduler
+            from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
             from apscheduler.triggers.interval import IntervalTrigger
             
-            scheduler = BackgroundScheduler()
-            
-            # Get schedule intervals from environment
-            monitor_hours = int(os.getenv('MONITOR_SCHEDULE_HOURS', 6))
-            news_hours = int(os.getenv('NEWS_CHECK_HOURS', 6))
+            global _scheduler_app
+            _scheduler_app = app
             
-            # Add news collection job
-            scheduler.add_job(
-                func=lambda: run_scheduled_job(app, 'news'),
-                trigger=IntervalTrigger(hours=news_hours),
-                id='scheduled_news_collection',
-                name='News Collection',
-                replace_existing=True
+            # Persist schedules in the app database so restarts keep their place;
+            # collapse missed runs into one instead of replaying each of them
+            scheduler = BackgroundScheduler(
+                jobstores={
+                    'default': SQLAlchemyJobStore(url=app.config['SQLALCHEMY_DATABASE_URI'])
+                },
+                job_defaults={
+                    'coalesce': True,
+                    'max_instances': 1,
+                    'misfire_grace_time': 600
+                }
             )
+            scheduler.start(paused=True)
             
-            # Add page monitoring job
-            scheduler.add_job(
-                func=lambda: run_scheduled_job(app, 'pages'),
-                trigger=IntervalTrigger(hours=monitor_hours),
-                id='scheduled_page_monitor',
-                name='Page Monitor',
-                replace_existing=True
-            )
+            # Schedule intervals from config
+            monitor_hours = Config.MONITOR_SCHEDULE_HOURS
+            news_hours = Config.NEWS_CHECK_HOURS
             
-            scheduler.start()
+            jobs = [
+                ('scheduled_news_collection', 'News Collection', _news_job, news_hours),
+                ('scheduled_page_monitor', 'Page Monitor', _pages_job, monitor_hours),
+            ]
+            for job_id, name, func, hours in jobs:
+                trigger = IntervalTrigger(hours=hours)
+                existing = scheduler.get_job(job_id)
+                if existing is None:
+                    scheduler.add_job(func=func, trigger=trigger, id=job_id, name=name)
+                elif existing.trigger.interval != trigger.interval:
+                    existing.reschedule(trigger=trigger)
+            
+            scheduler.resume()
             logger.info(f"Scheduler started: News every {news_hours}h, Pages every {monitor_hours}h")
             
         except Exception as e:
             logger.warning(f"Could not start scheduler: {e}")
 
 
+def _news_job():
+    """Scheduled entry point for news collection (module-level so it can be persisted)."""
+    run_scheduled_job(_scheduler_app, 'news')
+
+
+def _pages_job():
+    """Scheduled entry point for page monitoring (module-level so it can be persisted)."""
+    run_scheduled_job(_scheduler_app, 'pages')
+
+
+def _get_job_service(cls):
+    """Return the shared instance of a job service class, creating it on first use."""
+    service = _job_services.get(cls)
+    if service is None:
+        service = _job_services[cls] = cls()
+    return service
+
+
 def run_scheduled_job(app, job_type):
     """Run a scheduled monitoring job."""
     with app.app_context():
@@ -177,14 +495,16 @@ def run_scheduled_job(app, job_type):
                 from .analyzer import Analyzer
                 
                 logger.info("Running scheduled news collection...")
-                collector = NewsCollector()
+                collector = _get_job_service(NewsCollector)
+                # Commits once per competitor, after that competitor's feeds are fetched,
+                # so the SQLite write lock is never held across network I/O
                 results = collector.collect_all_news()
                 total = sum(len(items) for items in results.values())
                 logger.info(f"Collected {total} news items")
                 
                 # Run analysis on new items
                 if total > 0:
-                    analyzer = Analyzer()
+                    analyzer = _get_job_service(Analyzer)
                     analysis = analyzer.process_pending_items()
                     logger.info(f"Created {analysis['alerts_created']} alerts")
                     
@@ -193,13 +513,14 @@ def run_scheduled_job(app, job_type):
                 from .analyzer import Analyzer
                 
                 logger.info("Running scheduled page monitoring...")
-                monitor = PageMonitor()
+                monitor = _get_job_service(PageMonitor)
+                # Commits once per URL, before the politeness delay
                 changes = monitor.check_all_urls()
                 logger.info(f"Found {len(changes)} page changes")
                 
                 # Run analysis on changes
                 if changes:
-                    analyzer = Analyzer()
+                    analyzer = _get_job_service(Analyzer)
                     analysis = analyzer.process_pending_items()
                     logger.info(f"Created {analysis['alerts_created']} alerts")
                     
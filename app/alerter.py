@@ -4,16 +4,306 @@ Sends alerts via email, Slack, and Teams.
 """
 import os
 import json
+import time
+import atexit
+import hashlib
 import logging
 import smtplib
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Optional
+from typing import List, Optional, Union
 import requests
-from .database import db, Alert, RiskLevel
+from jinja2 import Environment, DictLoader, select_autoescape
+from requests.adapters import HTTPAdapter
+from sqlalchemy import update
+from sqlalchemy.orm import joinedload
+from urllib3.util.retry import Retry
+from .database import db, Alert, RiskLevel, SignalType, RISK_PRIORITY
+
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
 
 logger = logging.getLogger(__name__)
 
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+RISK_EMOJI = {
+    RiskLevel.CRITICAL.value: '🚨',
+    RiskLevel.HIGH.value: '🔴',
+    RiskLevel.MEDIUM.value: '🟡',
+    RiskLevel.LOW.value: '🟢',
+    RiskLevel.INFO.value: 'ℹ️'
+}
+
+RISK_COLOR = {
+    RiskLevel.CRITICAL.value: '#FF0000',
+    RiskLevel.HIGH.value: '#FF4444',
+    RiskLevel.MEDIUM.value: '#FFAA00',
+    RiskLevel.LOW.value: '#00AA00',
+    RiskLevel.INFO.value: '#0088FF'
+}
+
+# Display labels for the bounded signal/risk vocabularies
+SIGNAL_LABELS = {s.value: s.value.replace('_', ' ').title() for s in SignalType}
+RISK_LABELS = {r.value: r.value.upper() for r in RiskLevel}
+
+# Invariant payload pieces, shared by reference across sends
+_SLACK_SOURCE_BUTTON_TEXT = {"type": "plain_text", "text": "View Source"}
+_SLACK_DASHBOARD_BUTTON_TEXT = {"type": "plain_text", "text": "View in Dashboard"}
+
+EMAIL_TEXT_TEMPLATE = """
+COMPETITOR INTELLIGENCE ALERT
+{{ '=' * 50 }}
+
+{{ alert.title }}
+
+Competitor: {{ competitor_name }}
+Signal Type: {{ signal_type }}
+Risk Level: {{ risk_level }} ({{ alert.risk_score }}/100)
+Confidence: {{ alert.confidence_score }}%
+Detected: {{ detected }}
+
+SUMMARY
+{{ '-' * 50 }}
+{{ alert.summary }}
+
+RELEVANCE TO FLUKE
+{{ '-' * 50 }}
+{{ alert.relevance_explanation }}
+
+SOURCE
+{{ '-' * 50 }}
+{{ alert.source_url }}
+
+View in Dashboard: {{ dashboard_url }}
+"""
+
+EMAIL_HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .header { background-color: {{ color }}; color: white; padding: 20px; }
+        .content { padding: 20px; }
+        .section { margin-bottom: 20px; }
+        .section h3 { color: #555; border-bottom: 1px solid #ddd; padding-bottom: 5px; }
+        .facts { display: flex; flex-wrap: wrap; gap: 20px; }
+        .fact { min-width: 150px; }
+        .fact-label { font-weight: bold; color: #666; }
+        .actions { background-color: #f5f5f5; padding: 15px; border-radius: 5px; }
+        .btn { display: inline-block; padding: 10px 20px; background-color: #007bff; color: white; 
+                text-decoration: none; border-radius: 5px; margin-right: 10px; }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>{{ emoji }} {{ alert.title }}</h1>
+    </div>
+    <div class="content">
+        <div class="section">
+            <div class="facts">
+                <div class="fact">
+                    <div class="fact-label">Competitor</div>
+                    <div>{{ competitor_name }}</div>
+                </div>
+                <div class="fact">
+                    <div class="fact-label">Signal Type</div>
+                    <div>{{ signal_type }}</div>
+                </div>
+                <div class="fact">
+                    <div class="fact-label">Risk Level</div>
+                    <div>{{ risk_level }} ({{ alert.risk_score }}/100)</div>
+                </div>
+                <div class="fact">
+                    <div class="fact-label">Confidence</div>
+                    <div>{{ alert.confidence_score }}%</div>
+                </div>
+            </div>
+        </div>
+        
+        <div class="section">
+            <h3>Summary</h3>
+            <p>{{ alert.summary }}</p>
+        </div>
+        
+        <div class="section">
+            <h3>Relevance to Fluke</h3>
+            <p>{{ alert.relevance_explanation }}</p>
+        </div>
+        
+        <div class="section actions">
+            <h3>Recommended Actions</h3>
+            {% if actions %}<ul>{% for a in actions %}<li><strong>{{ a.get('action', 'N/A') }}</strong> ({{ a.get('priority', 'N/A') }} priority) - Owner: {{ a.get('owner', 'N/A') }}</li>{% endfor %}</ul>{% else %}<p>No specific actions recommended</p>{% endif %}
+        </div>
+        
+        <div class="section">
+            <a href="{{ alert.source_url }}" class="btn">View Source</a>
+            <a href="{{ dashboard_url }}" class="btn">View in Dashboard</a>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+# Compiled once; HTML output escapes alert text
+_email_env = Environment(
+    loader=DictLoader({'alert.txt': EMAIL_TEXT_TEMPLATE, 'alert.html': EMAIL_HTML_TEMPLATE}),
+    autoescape=select_autoescape(['html']),
+    auto_reload=False,
+    keep_trailing_newline=True
+)
+_EMAIL_TEXT = _email_env.get_template('alert.txt')
+_EMAIL_HTML = _email_env.get_template('alert.html')
+
+# (connect, read) timeouts for webhook posts
+WEBHOOK_TIMEOUT = (3.05, 10)
+
+# Concurrent channel sends in send_pending_alerts
+SEND_WORKERS = int(os.getenv('ALERT_SEND_WORKERS', 16))
+
+# Per-webhook rate limit (Slack allows ~1 message/sec per channel)
+WEBHOOK_RATE_PER_SEC = float(os.getenv('WEBHOOK_RATE_PER_SEC', 1.0))
+WEBHOOK_BURST = 5
+
+# Identical sends within this window are suppressed
+DEDUP_TTL_SECONDS = int(os.getenv('ALERT_DEDUP_TTL', 180))
+DEDUP_MAX_ENTRIES = 10000
+
+# Channel result for a send skipped as a duplicate. The alert still counts as
+# handled, so it isn't sent again once the dedup window lapses.
+SUPPRESSED = 'suppressed'
+
+_http_session = None
+_recent_sends = {}
+_webhook_buckets = {}
+_webhook_buckets_lock = threading.Lock()
+_recent_sends_lock = threading.Lock()
+
+
+def _get_http_session() -> requests.Session:
+    """Get the process-wide keep-alive session used for Slack/Teams webhooks."""
+    global _http_session
+    if _http_session is None:
+        # Webhook posts aren't idempotent: only retry when the message can't
+        # have been accepted (connection never made, or 429 rate limited)
+        retry = Retry(
+            total=3,
+            connect=3,
+            read=0,
+            other=0,
+            backoff_factor=0.3,
+            status_forcelist=[429],
+            allowed_methods=frozenset(['POST']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        # Every send worker can hold a keep-alive connection without blocking
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=max(32, SEND_WORKERS),
+            pool_block=False,
+            max_retries=retry
+        )
+        session = requests.Session()
+        session.mount('https://', adapter)
+        atexit.register(session.close)
+        _http_session = session
+    return _http_session
+
+
+class _TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is free."""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """Take a token, returning how long the caller waited."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+def _webhook_bucket(url: str) -> _TokenBucket:
+    """Get the rate limiter for a webhook URL, so one throttled hook doesn't stall others."""
+    with _webhook_buckets_lock:
+        bucket = _webhook_buckets.get(url)
+        if bucket is None:
+            bucket = _TokenBucket(WEBHOOK_RATE_PER_SEC, WEBHOOK_BURST)
+            _webhook_buckets[url] = bucket
+        return bucket
+
+
+@lru_cache(maxsize=None)
+def _levels_at_or_above(min_risk_level: str) -> tuple:
+    """Risk levels whose priority meets the threshold (unknown thresholds mean medium)."""
+    min_priority = RISK_PRIORITY.get(min_risk_level, 3)
+    return tuple(level for level, priority in RISK_PRIORITY.items() if priority >= min_priority)
+
+
+def _signal_label(signal_type: str) -> str:
+    """Human-readable signal type, e.g. 'pricing_change' -> 'Pricing Change'."""
+    label = SIGNAL_LABELS.get(signal_type)
+    return label if label is not None else signal_type.replace('_', ' ').title()
+
+
+def _risk_label(risk_level: str) -> str:
+    """Upper-cased risk level for display."""
+    label = RISK_LABELS.get(risk_level)
+    return label if label is not None else risk_level.upper()
+
+
+def _competitor_name(alert: Alert) -> str:
+    """Competitor name for display; relies on competitor being eager-loaded in batches."""
+    competitor = alert.competitor
+    return competitor.name if competitor else 'Unknown'
+
+
+def _dedup_key(channel: str, alert: Alert) -> bytes:
+    """Stable key identifying an alert's content on a channel."""
+    raw = f"{channel}|{alert.competitor_id}|{alert.signal_type}|{alert.source_url}|{alert.title}"
+    return hashlib.blake2b(raw.encode(), digest_size=16).digest()
+
+
+def _is_duplicate(key: bytes) -> bool:
+    """Check whether the same send happened within the dedup window."""
+    with _recent_sends_lock:
+        expires_at = _recent_sends.get(key)
+        return expires_at is not None and expires_at > time.monotonic()
+
+
+def _remember_send(key: bytes):
+    """Record a successful send for the dedup window."""
+    now = time.monotonic()
+    with _recent_sends_lock:
+        if len(_recent_sends) >= DEDUP_MAX_ENTRIES:
+            for k in [k for k, exp in _recent_sends.items() if exp <= now]:
+                del _recent_sends[k]
+            if len(_recent_sends) >= DEDUP_MAX_ENTRIES:
+                _recent_sends.clear()
+        _recent_sends[key] = now + DEDUP_TTL_SECONDS
+
 
 class Alerter:
     """Handles sending notifications for alerts."""
@@ -32,39 +322,57 @@ class Alerter:
         self.smtp_user = os.getenv('SMTP_USER')
         self.smtp_password = os.getenv('SMTP_PASSWORD')
         self.alert_email_to = os.getenv('ALERT_EMAIL_TO')
+        
+        # Dashboard links
+        self.app_url = os.getenv('APP_URL', 'http://localhost:5000')
+        
+        # Shared HTTP session so webhook posts reuse TLS connections
+        self.http = _get_http_session()
     
     def _get_risk_emoji(self, risk_level: str) -> str:
         """Get emoji for risk level."""
-        return {
-            RiskLevel.CRITICAL.value: '🚨',
-            RiskLevel.HIGH.value: '🔴',
-            RiskLevel.MEDIUM.value: '🟡',
-            RiskLevel.LOW.value: '🟢',
-            RiskLevel.INFO.value: 'ℹ️'
-        }.get(risk_level, '⚪')
+        return RISK_EMOJI.get(risk_level, '⚪')
     
     def _get_risk_color(self, risk_level: str) -> str:
         """Get color for risk level (for Slack/Teams)."""
-        return {
-            RiskLevel.CRITICAL.value: '#FF0000',
-            RiskLevel.HIGH.value: '#FF4444',
-            RiskLevel.MEDIUM.value: '#FFAA00',
-            RiskLevel.LOW.value: '#00AA00',
-            RiskLevel.INFO.value: '#0088FF'
-        }.get(risk_level, '#888888')
+        return RISK_COLOR.get(risk_level, '#888888')
+    
+    def _post_webhook(self, url: str, payload: dict, channel: str) -> requests.Response:
+        """POST a JSON payload to a webhook, respecting its rate limit."""
+        waited = _webhook_bucket(url).acquire()
+        if waited:
+            logger.info(f"Rate limited {channel} webhook, waited {waited:.1f}s")
+        
+        # 429 retries honor Retry-After via the session's Retry policy
+        response = self.http.post(
+            url,
+            data=_json_dumps(payload),
+            headers=JSON_HEADERS,
+            timeout=WEBHOOK_TIMEOUT,
+            # Webhooks never redirect; don't pay a second handshake on a bad URL
+            allow_redirects=False
+        )
+        response.raise_for_status()
+        return response
     
-    def send_slack_alert(self, alert: Alert) -> bool:
+    def send_slack_alert(self, alert: Alert, actions: Optional[list] = None) -> Union[bool, str]:
         """Send alert to Slack."""
         if not self.slack_webhook:
             logger.warning("Slack webhook not configured")
             return False
         
+        dedup_key = _dedup_key('slack', alert)
+        if _is_duplicate(dedup_key):
+            logger.info(f"Suppressed duplicate Slack alert for alert {alert.id}")
+            return SUPPRESSED
+        
         try:
             emoji = self._get_risk_emoji(alert.risk_level)
             color = self._get_risk_color(alert.risk_level)
             
-            # Get recommended actions
-            actions = alert.get_recommended_actions()
+            # Get recommended actions unless the caller already parsed them
+            if actions is None:
+                actions = alert.get_recommended_actions()
             actions_text = "\n".join([
                 f"• {a.get('action', 'N/A')} ({a.get('priority', 'N/A')} - {a.get('owner', 'N/A')})"
                 for a in actions[:5]
@@ -90,15 +398,15 @@ class Alerter:
                                 "fields": [
                                     {
                                         "type": "mrkdwn",
-                                        "text": f"*Competitor:*\n{alert.competitor.name if alert.competitor else 'Unknown'}"
+                                        "text": f"*Competitor:*\n{_competitor_name(alert)}"
                                     },
                                     {
                                         "type": "mrkdwn",
-                                        "text": f"*Signal Type:*\n{alert.signal_type.replace('_', ' ').title()}"
+                                        "text": f"*Signal Type:*\n{_signal_label(alert.signal_type)}"
                                     },
                                     {
                                         "type": "mrkdwn",
-                                        "text": f"*Risk Level:*\n{alert.risk_level.upper()} ({alert.risk_score}/100)"
+                                        "text": f"*Risk Level:*\n{_risk_label(alert.risk_level)} ({alert.risk_score}/100)"
                                     },
                                     {
                                         "type": "mrkdwn",
@@ -132,19 +440,13 @@ class Alerter:
                                 "elements": [
                                     {
                                         "type": "button",
-                                        "text": {
-                                            "type": "plain_text",
-                                            "text": "View Source"
-                                        },
+                                        "text": _SLACK_SOURCE_BUTTON_TEXT,
                                         "url": alert.source_url
                                     },
                                     {
                                         "type": "button",
-                                        "text": {
-                                            "type": "plain_text",
-                                            "text": "View in Dashboard"
-                                        },
-                                        "url": f"{os.getenv('APP_URL', 'http://localhost:5000')}/alerts/{alert.id}"
+                                        "text": _SLACK_DASHBOARD_BUTTON_TEXT,
+                                        "url": f"{self.app_url}/alerts/{alert.id}"
                                     }
                                 ]
                             }
@@ -153,13 +455,9 @@ class Alerter:
                 ]
             }
             
-            response = requests.post(
-                self.slack_webhook,
-                json=payload,
-                timeout=10
-            )
-            response.raise_for_status()
+            self._post_webhook(self.slack_webhook, payload, 'Slack')
             
+            _remember_send(dedup_key)
             logger.info(f"Slack alert sent for alert {alert.id}")
             return True
             
@@ -167,18 +465,24 @@ class Alerter:
             logger.error(f"Error sending Slack alert: {e}")
             return False
     
-    def send_teams_alert(self, alert: Alert) -> bool:
+    def send_teams_alert(self, alert: Alert, actions: Optional[list] = None) -> Union[bool, str]:
         """Send alert to Microsoft Teams."""
         if not self.teams_webhook:
             logger.warning("Teams webhook not configured")
             return False
         
+        dedup_key = _dedup_key('teams', alert)
+        if _is_duplicate(dedup_key):
+            logger.info(f"Suppressed duplicate Teams alert for alert {alert.id}")
+            return SUPPRESSED
+        
         try:
             emoji = self._get_risk_emoji(alert.risk_level)
             color = self._get_risk_color(alert.risk_level)
             
-            # Get recommended actions
-            actions = alert.get_recommended_actions()
+            # Get recommended actions unless the caller already parsed them
+            if actions is None:
+                actions = alert.get_recommended_actions()
             actions_text = "\n\n".join([
                 f"- **{a.get('action', 'N/A')}** ({a.get('priority', 'N/A')}) - Owner: {a.get('owner', 'N/A')}"
                 for a in actions[:5]
@@ -193,9 +497,9 @@ class Alerter:
                     {
                         "activityTitle": f"{emoji} {alert.title}",
                         "facts": [
-                            {"name": "Competitor", "value": alert.competitor.name if alert.competitor else "Unknown"},
-                            {"name": "Signal Type", "value": alert.signal_type.replace('_', ' ').title()},
-                            {"name": "Risk Level", "value": f"{alert.risk_level.upper()} ({alert.risk_score}/100)"},
+                            {"name": "Competitor", "value": _competitor_name(alert)},
+                            {"name": "Signal Type", "value": _signal_label(alert.signal_type)},
+                            {"name": "Risk Level", "value": f"{_risk_label(alert.risk_level)} ({alert.risk_score}/100)"},
                             {"name": "Confidence", "value": f"{alert.confidence_score}%"},
                             {"name": "Detected", "value": alert.detected_at.strftime('%Y-%m-%d %H:%M UTC')}
                         ],
@@ -223,18 +527,14 @@ class Alerter:
                     {
                         "@type": "OpenUri",
                         "name": "View in Dashboard",
-                        "targets": [{"os": "default", "uri": f"{os.getenv('APP_URL', 'http://localhost:5000')}/alerts/{alert.id}"}]
+                        "targets": [{"os": "default", "uri": f"{self.app_url}/alerts/{alert.id}"}]
                     }
                 ]
             }
             
-            response = requests.post(
-                self.teams_webhook,
-                json=payload,
-                timeout=10
-            )
-            response.raise_for_status()
+            self._post_webhook(self.teams_webhook, payload, 'Teams')
             
+            _remember_send(dedup_key)
             logger.info(f"Teams alert sent for alert {alert.id}")
             return True
             
@@ -242,140 +542,81 @@ class Alerter:
             logger.error(f"Error sending Teams alert: {e}")
             return False
     
-    def send_email_alert(self, alert: Alert, to_addresses: Optional[List[str]] = None) -> bool:
-        """Send alert via email."""
+    def _email_recipients(self, to_addresses: Optional[List[str]] = None) -> Optional[List[str]]:
+        """Get email recipients, or None if email can't be sent."""
         if not all([self.smtp_host, self.smtp_user, self.smtp_password]):
             logger.warning("Email not fully configured")
-            return False
+            return None
         
         to_addresses = to_addresses or [self.alert_email_to]
         if not to_addresses or not to_addresses[0]:
             logger.warning("No email recipients configured")
-            return False
+            return None
         
+        return to_addresses
+    
+    def _connect_smtp(self) -> smtplib.SMTP:
+        """Open an authenticated SMTP connection."""
+        server = smtplib.SMTP(self.smtp_host, self.smtp_port)
         try:
-            emoji = self._get_risk_emoji(alert.risk_level)
-            
-            # Get recommended actions
+            server.starttls()
+            server.login(self.smtp_user, self.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    def _build_email_message(self, alert: Alert, to_addresses: List[str],
+                             actions: Optional[list] = None) -> MIMEMultipart:
+        """Build the plain text + HTML message for an alert."""
+        if actions is None:
             actions = alert.get_recommended_actions()
-            actions_html = "<ul>" + "".join([
-                f"<li><strong>{a.get('action', 'N/A')}</strong> "
-                f"({a.get('priority', 'N/A')} priority) - Owner: {a.get('owner', 'N/A')}</li>"
-                for a in actions[:5]
-            ]) + "</ul>" if actions else "<p>No specific actions recommended</p>"
-            
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = f"{emoji} [{alert.risk_level.upper()}] {alert.title}"
-            msg['From'] = self.smtp_user
-            msg['To'] = ', '.join(to_addresses)
-            
-            # Plain text version
-            text_content = f"""
-COMPETITOR INTELLIGENCE ALERT
-{'='*50}
-
-{alert.title}
-
-Competitor: {alert.competitor.name if alert.competitor else 'Unknown'}
-Signal Type: {alert.signal_type.replace('_', ' ').title()}
-Risk Level: {alert.risk_level.upper()} ({alert.risk_score}/100)
-Confidence: {alert.confidence_score}%
-Detected: {alert.detected_at.strftime('%Y-%m-%d %H:%M UTC')}
-
-SUMMARY
-{'-'*50}
-{alert.summary}
-
-RELEVANCE TO FLUKE
-{'-'*50}
-{alert.relevance_explanation}
-
-SOURCE
-{'-'*50}
-{alert.source_url}
-
-View in Dashboard: {os.getenv('APP_URL', 'http://localhost:5000')}/alerts/{alert.id}
-"""
-            
-            # HTML version
-            html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <style>
-        body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-        .header {{ background-color: {self._get_risk_color(alert.risk_level)}; color: white; padding: 20px; }}
-        .content {{ padding: 20px; }}
-        .section {{ margin-bottom: 20px; }}
-        .section h3 {{ color: #555; border-bottom: 1px solid #ddd; padding-bottom: 5px; }}
-        .facts {{ display: flex; flex-wrap: wrap; gap: 20px; }}
-        .fact {{ min-width: 150px; }}
-        .fact-label {{ font-weight: bold; color: #666; }}
-        .actions {{ background-color: #f5f5f5; padding: 15px; border-radius: 5px; }}
-        .btn {{ display: inline-block; padding: 10px 20px; background-color: #007bff; color: white; 
-                text-decoration: none; border-radius: 5px; margin-right: 10px; }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>{emoji} {alert.title}</h1>
-    </div>
-    <div class="content">
-        <div class="section">
-            <div class="facts">
-                <div class="fact">
-                    <div class="fact-label">Competitor</div>
-                    <div>{alert.competitor.name if alert.competitor else 'Unknown'}</div>
-                </div>
-                <div class="fact">
-                    <div class="fact-label">Signal Type</div>
-                    <div>{alert.signal_type.replace('_', ' ').title()}</div>
-                </div>
-                <div class="fact">
-                    <div class="fact-label">Risk Level</div>
-                    <div>{alert.risk_level.upper()} ({alert.risk_score}/100)</div>
-                </div>
-                <div class="fact">
-                    <div class="fact-label">Confidence</div>
-                    <div>{alert.confidence_score}%</div>
-                </div>
-            </div>
-        </div>
         
-        <div class="section">
-            <h3>Summary</h3>
-            <p>{alert.summary}</p>
-        </div>
+        emoji = self._get_risk_emoji(alert.risk_level)
         
-        <div class="section">
-            <h3>Relevance to Fluke</h3>
-            <p>{alert.relevance_explanation}</p>
-        </div>
+        # Create message
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = f"{emoji} [{_risk_label(alert.risk_level)}] {alert.title}"
+        msg['From'] = self.smtp_user
+        msg['To'] = ', '.join(to_addresses)
         
-        <div class="section actions">
-            <h3>Recommended Actions</h3>
-            {actions_html}
-        </div>
+        context = {
+            'alert': alert,
+            'emoji': emoji,
+            'color': self._get_risk_color(alert.risk_level),
+            'competitor_name': _competitor_name(alert),
+            'signal_type': _signal_label(alert.signal_type),
+            'risk_level': _risk_label(alert.risk_level),
+            'detected': alert.detected_at.strftime('%Y-%m-%d %H:%M UTC'),
+            'actions': actions[:5],
+            'dashboard_url': f"{self.app_url}/alerts/{alert.id}"
+        }
         
-        <div class="section">
-            <a href="{alert.source_url}" class="btn">View Source</a>
-            <a href="{os.getenv('APP_URL', 'http://localhost:5000')}/alerts/{alert.id}" class="btn">View in Dashboard</a>
-        </div>
-    </div>
-</body>
-</html>
-"""
-            
-            msg.attach(MIMEText(text_content, 'plain'))
-            msg.attach(MIMEText(html_content, 'html'))
+        msg.attach(MIMEText(_EMAIL_TEXT.render(context), 'plain'))
+        msg.attach(MIMEText(_EMAIL_HTML.render(context), 'html'))
+        
+        return msg
+    
+    def send_email_alert(self, alert: Alert, to_addresses: Optional[List[str]] = None,
+                         actions: Optional[list] = None) -> Union[bool, str]:
+        """Send alert via email."""
+        to_addresses = self._email_recipients(to_addresses)
+        if not to_addresses:
+            return False
+        
+        dedup_key = _dedup_key('email', alert)
+        if _is_duplicate(dedup_key):
+            logger.info(f"Suppressed duplicate email alert for alert {alert.id}")
+            return SUPPRESSED
+        
+        try:
+            msg = self._build_email_message(alert, to_addresses, actions)
             
             # Send email
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
+            with self._connect_smtp() as server:
                 server.send_message(msg)
             
+            _remember_send(dedup_key)
             logger.info(f"Email alert sent for alert {alert.id}")
             return True
             
@@ -383,7 +624,89 @@ View in Dashboard: {os.getenv('APP_URL', 'http://localhost:5000')}/alerts/{alert
             logger.error(f"Error sending email alert: {e}")
             return False
     
-    def send_alert(self, alert: Alert, channels: Optional[List[str]] = None) -> dict:
+    def send_email_batch(self, alerts: List[Alert],
+                         to_addresses: Optional[List[str]] = None,
+                         actions_by_id: Optional[dict] = None) -> dict:
+        """
+        Send several alerts over a single SMTP connection.
+        
+        Args:
+            alerts: The alerts to email
+            to_addresses: Recipients, defaulting to ALERT_EMAIL_TO
+            actions_by_id: Already parsed recommended actions keyed by alert id
+        
+        Returns:
+            Dict mapping alert id to True if sent, SUPPRESSED if a recent
+            duplicate, otherwise False
+        """
+        results = {alert.id: False for alert in alerts}
+        to_addresses = self._email_recipients(to_addresses)
+        if not to_addresses:
+            return results
+        
+        keys = {}
+        for alert in alerts:
+            key = _dedup_key('email', alert)
+            if _is_duplicate(key):
+                logger.info(f"Suppressed duplicate email alert for alert {alert.id}")
+                results[alert.id] = SUPPRESSED
+            else:
+                keys[alert.id] = key
+        if not keys:
+            return results
+        
+        try:
+            with self._connect_smtp() as server:
+                for alert in alerts:
+                    if alert.id not in keys:
+                        continue
+                    try:
+                        actions = actions_by_id.get(alert.id) if actions_by_id else None
+                        server.send_message(self._build_email_message(alert, to_addresses, actions))
+                        _remember_send(keys[alert.id])
+                        results[alert.id] = True
+                    except smtplib.SMTPServerDisconnected:
+                        raise
+                    except Exception as e:
+                        logger.error(f"Error sending email alert {alert.id}: {e}")
+        except Exception as e:
+            logger.error(f"Error sending email batch: {e}")
+        
+        logger.info(f"Email batch sent {sum(1 for r in results.values() if r is True)}/{len(keys)} alerts")
+        return results
+    
+    def _resolve_channels(self, channels: Optional[List[str]]) -> List[str]:
+        """Get the channels to send on, defaulting to all configured ones."""
+        if channels is not None:
+            return [ch for ch in channels if ch in ('slack', 'teams', 'email')]
+        
+        channels = []
+        if self.slack_webhook:
+            channels.append('slack')
+        if self.teams_webhook:
+            channels.append('teams')
+        if self.smtp_host and self.alert_email_to:
+            channels.append('email')
+        return channels
+    
+    def _send_channel(self, channel: str, alert: Alert, actions: Optional[list] = None) -> Union[bool, str]:
+        """Send alert on a single channel (True, False or SUPPRESSED)."""
+        if channel == 'slack':
+            return self.send_slack_alert(alert, actions=actions)
+        if channel == 'teams':
+            return self.send_teams_alert(alert, actions=actions)
+        return self.send_email_alert(alert, actions=actions)
+    
+    def _record_results(self, alert: Alert, results: dict):
+        """Mark alert as notified on the channels that succeeded (or were suppressed as duplicates)."""
+        sent_channels = [ch for ch, result in results.items() if result is True]
+        if sent_channels or SUPPRESSED in results.values():
+            alert.notification_sent = True
+        if sent_channels:
+            alert.notification_channels = ','.join(sent_channels)
+    
+    def send_alert(self, alert: Alert, channels: Optional[List[str]] = None,
+                   commit: bool = True) -> dict:
         """
         Send alert through specified channels.
         
@@ -391,34 +714,23 @@ View in Dashboard: {os.getenv('APP_URL', 'http://localhost:5000')}/alerts/{alert
             alert: The alert to send
             channels: List of channels ('slack', 'teams', 'email'). 
                      If None, uses all configured channels.
+            commit: If False, leave committing the notification status to the caller
         
         Returns:
             Dict with results for each channel
         """
         results = {}
         
-        if channels is None:
-            channels = []
-            if self.slack_webhook:
-                channels.append('slack')
-            if self.teams_webhook:
-                channels.append('teams')
-            if self.smtp_host and self.alert_email_to:
-                channels.append('email')
+        channels = self._resolve_channels(channels)
+        # Parsed once and shared by every channel formatter
+        actions = alert.get_recommended_actions() if channels else None
         
         for channel in channels:
-            if channel == 'slack':
-                results['slack'] = self.send_slack_alert(alert)
-            elif channel == 'teams':
-                results['teams'] = self.send_teams_alert(alert)
-            elif channel == 'email':
-                results['email'] = self.send_email_alert(alert)
+            results[channel] = self._send_channel(channel, alert, actions)
         
         # Update alert with notification status
-        sent_channels = [ch for ch, success in results.items() if success]
-        if sent_channels:
-            alert.notification_sent = True
-            alert.notification_channels = ','.join(sent_channels)
+        self._record_results(alert, results)
+        if commit and alert.notification_sent:
             db.session.commit()
         
         return results
@@ -427,42 +739,76 @@ View in Dashboard: {os.getenv('APP_URL', 'http://localhost:5000')}/alerts/{alert
         """
         Send notifications for all pending alerts above a risk threshold.
         
+        Every (alert, channel) send runs on a bounded thread pool; results
+        are recorded on the main thread and committed once at the end.
+        
         Returns:
             Summary of sent notifications
         """
-        risk_priority = {
-            RiskLevel.CRITICAL.value: 5,
-            RiskLevel.HIGH.value: 4,
-            RiskLevel.MEDIUM.value: 3,
-            RiskLevel.LOW.value: 2,
-            RiskLevel.INFO.value: 1
-        }
+        allowed_levels = _levels_at_or_above(min_risk_level)
         
-        min_priority = risk_priority.get(min_risk_level, 3)
-        
-        # Get unsent alerts
-        pending_alerts = Alert.query.filter(
-            Alert.notification_sent == False
-        ).all()
-        
-        # Filter by risk level
-        pending_alerts = [
-            a for a in pending_alerts 
-            if risk_priority.get(a.risk_level, 0) >= min_priority
-        ]
+        # Get unsent alerts at or above the threshold
+        pending_alerts = Alert.query.options(
+            joinedload(Alert.competitor)
+        ).filter(
+            Alert.notification_sent == False,
+            Alert.risk_level.in_(allowed_levels)
+        ).order_by(Alert.risk_score.desc()).all()
         
         summary = {
             'total_pending': len(pending_alerts),
             'sent': 0,
+            'suppressed': 0,
             'failed': 0,
             'details': []
         }
         
+        channels = self._resolve_channels(None)
+        all_results = {alert.id: {} for alert in pending_alerts}
+        
+        if pending_alerts and channels:
+            # competitor is eager-loaded, so worker threads never touch the session
+            actions_by_id = {alert.id: alert.get_recommended_actions() for alert in pending_alerts}
+            
+            with ThreadPoolExecutor(max_workers=SEND_WORKERS) as executor:
+                futures = {
+                    executor.submit(self._send_channel, channel, alert, actions_by_id[alert.id]): (alert, channel)
+                    for alert in pending_alerts
+                    for channel in channels
+                    if channel != 'email'
+                }
+                # All emails share one SMTP connection instead of one per alert
+                if 'email' in channels:
+                    future = executor.submit(self.send_email_batch, pending_alerts, None, actions_by_id)
+                    futures[future] = (None, 'email')
+                
+                for future in as_completed(futures):
+                    alert, channel = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"Error sending {channel} alerts: {e}")
+                        result = False
+                    
+                    if alert is None:
+                        for alert_id, results in all_results.items():
+                            results[channel] = result.get(alert_id, False) if result else False
+                    else:
+                        all_results[alert.id][channel] = result
+        
+        # Group handled alerts by channel set so status is one UPDATE per group;
+        # alerts whose only outcome was a suppressed duplicate are marked sent too
+        sent_ids = {}
         for alert in pending_alerts:
-            results = self.send_alert(alert)
+            results = all_results[alert.id]
+            sent_channels = ','.join(ch for ch, result in results.items() if result is True)
             
-            if any(results.values()):
+            if sent_channels:
+                sent_ids.setdefault(sent_channels, []).append(alert.id)
                 summary['sent'] += 1
+            elif SUPPRESSED in results.values():
+                sent_ids.setdefault(None, []).append(alert.id)
+                summary['suppressed'] += 1
             else:
                 summary['failed'] += 1
             
@@ -472,6 +818,19 @@ View in Dashboard: {os.getenv('APP_URL', 'http://localhost:5000')}/alerts/{alert
                 'results': results
             })
         
+        if sent_ids:
+            try:
+                for sent_channels, alert_ids in sent_ids.items():
+                    db.session.execute(
+                        update(Alert)
+                        .where(Alert.id.in_(alert_ids))
+                        .values(notification_sent=True, notification_channels=sent_channels)
+                    )
+                db.session.commit()
+            except Exception as e:
+                logger.error(f"Error recording alert notification status: {e}")
+                db.session.rollback()
+        
         return summary
 
 
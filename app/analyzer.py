@@ -4,19 +4,179 @@ Analyzes detected changes and generates actionable intelligence.
 """
 import os
 import json
+import hashlib
 import yaml
+import atexit
+import asyncio
 import logging
+import requests
+import tiktoken
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
-from datetime import datetime
-from openai import OpenAI, AzureOpenAI
+from pydantic import BaseModel, ConfigDict, Field
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from datetime import datetime, timedelta
+from flask import current_app
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from sqlalchemy import exists
+from sqlalchemy.orm import joinedload, undefer
+from openai import OpenAI, AzureOpenAI, AsyncOpenAI, AsyncAzureOpenAI
 from .database import (
-    db, Alert, PageSnapshot, NewsItem, Competitor,
+    db, Alert, PageSnapshot, NewsItem, Competitor, MonitoredURL, AnalysisBatch, AnalysisCache,
     SignalType, RiskLevel, AlertStatus
 )
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> str:
+        # Alert/cache columns are TEXT, so hand back str rather than bytes
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
 logger = logging.getLogger(__name__)
 
+# libyaml's C loader is several times faster than the pure-Python one
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+    logger.warning("libyaml not available, falling back to the pure-Python YAML loader")
+
+
+def _build_teams_session() -> requests.Session:
+    """Build the keep-alive session used for Teams webhook notifications."""
+    # Posts aren't idempotent: only retry when Teams can't have accepted the
+    # message (connection never made, or 429 rate limited)
+    retry = Retry(
+        total=3,
+        connect=3,
+        read=0,
+        other=0,
+        backoff_factor=0.3,
+        status_forcelist=[429],
+        allowed_methods=frozenset(['POST']),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+    atexit.register(session.close)
+    return session
+
+
+# Reused across notifications so the TLS handshake to the webhook host happens once
+_TEAMS_SESSION = _build_teams_session()
+
+# Teams notifications run off the analysis path; pending ones are drained at exit
+_NOTIFY_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='teams-notify')
+atexit.register(_NOTIFY_EXECUTOR.shutdown, wait=True)
+
+# Valid enum values for validating LLM output
+_SIGNAL_TYPE_VALUES = frozenset(st.value for st in SignalType)
+_RISK_LEVEL_VALUES = frozenset(rl.value for rl in RiskLevel)
+
+# Concurrent LLM requests in process_pending_items
+ANALYSIS_CONCURRENCY = int(os.getenv('OPENAI_CONCURRENCY', 10))
+
+PRIORITY_GUIDANCE = """## PRIORITY GUIDANCE
+- Partnership signals should generally be rated HIGH risk (risk_score 65-85) as they can significantly alter competitive dynamics
+- Partnerships with major tech companies (Microsoft, Google, Amazon, Siemens, Schneider Electric, etc.) should be rated HIGH (risk_score 75-90)
+- Partnerships with industry leaders or Fortune 500 companies warrant HIGH priority
+- Only rate partnerships as CRITICAL (risk_score 85+) if they directly threaten Fluke's core markets or involve exclusive deals
+- Smaller partnerships with regional distributors or niche players can remain MEDIUM (risk_score 45-65)"""
+
+ANALYSIS_RESPONSE_SPEC = """{
+    "summary": "2-3 sentence executive summary of the change/news",
+    "signal_type": "one of: product_launch, pricing_change, feature_update, partnership, acquisition, leadership_change, marketing_campaign, certification, expansion, regulatory, other",
+    "risk_level": "one of: critical, high, medium, low, info",
+    "risk_score": "0-100 integer, where 100 is highest risk to Fluke",
+    "confidence_score": "0-100 integer, your confidence in this analysis",
+    "relevance_to_fluke": "Explain specifically how this impacts Fluke's business",
+    "key_details": ["list", "of", "important", "specific", "details"],
+    "assumptions": ["list", "of", "assumptions", "you", "made"],
+    "recommended_playbook": "name of the most appropriate playbook from the list above",
+    "immediate_actions": [
+        {"action": "specific action to take", "owner": "team/role", "priority": "high/medium/low", "rationale": "why this matters"}
+    ],
+    "questions_to_answer": ["list", "of", "questions", "that", "need", "investigation"],
+    "monitoring_recommendations": "What should we continue to watch for?"
+}"""
+
+# Per-item user prompt; everything static lives in the system prompt
+ANALYSIS_PROMPT_TEMPLATE = """Analyze the following {source_type} from competitor "{competitor_name}" and provide actionable intelligence.
+
+## CONTENT TO ANALYZE
+{content}
+
+{additional_context}
+
+## YOUR TASK
+Analyze this content and provide a structured assessment. Be specific and actionable.
+Respond with a single analysis object in the format above."""
+
+# Token budget for the page excerpt in page-change prompts
+PAGE_EXCERPT_TOKENS = int(os.getenv('PAGE_EXCERPT_TOKENS', 800))
+
+# Skip page text identical to one already alerted within this many days
+CONTENT_REUSE_DAYS = int(os.getenv('CONTENT_REUSE_DAYS', 7))
+
+# News items packed into one prompt; the shared context is sent once per group
+NEWS_ITEMS_PER_PROMPT = int(os.getenv('NEWS_ITEMS_PER_PROMPT', 6))
+
+# Reuse analyses of identical content instead of calling the LLM again
+ANALYSIS_CACHE_ENABLED = os.getenv('ANALYSIS_CACHE_ENABLED', '1') == '1'
+ANALYSIS_CACHE_TTL_DAYS = int(os.getenv('ANALYSIS_CACHE_TTL_DAYS', 7))
+
+# Prompt lines left out of the cache key (volatile per-snapshot values)
+_VOLATILE_CONTENT_PREFIXES = ('Change Detected:',)
+
+# Batch API job states that won't change any more
+BATCH_DONE_STATES = ('completed', 'failed', 'expired', 'cancelled')
+
+
+CONFIG_DIR = os.path.join(os.path.dirname(__file__), '..', 'config')
+FLUKE_CONTEXT_PATH = os.path.join(CONFIG_DIR, 'fluke_context.md')
+PLAYBOOKS_PATH = os.path.join(CONFIG_DIR, 'playbooks.yaml')
+COMPILED_PLAYBOOKS_PATH = os.path.join(CONFIG_DIR, 'playbooks.json')
+
+
+def _mtime(path: str) -> Optional[float]:
+    """File modification time, or None if it doesn't exist."""
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+# Config files are parsed once per process; the mtime is part of the cache
+# key so an edited file is picked up by the next Analyzer
+
+@lru_cache(maxsize=4)
+def _read_fluke_context(path: str, mtime: Optional[float]) -> Optional[str]:
+    """Read the Fluke context document, or None if missing."""
+    if mtime is None:
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@lru_cache(maxsize=4)
+def _read_playbooks(path: str, mtime: Optional[float], compiled_mtime: Optional[float]) -> Optional[Dict]:
+    """Parse the playbooks, preferring the JSON build (app.compile_configs) unless the YAML is newer."""
+    if mtime is None:
+        return None
+    if compiled_mtime is not None and compiled_mtime >= mtime:
+        with open(COMPILED_PLAYBOOKS_PATH, 'rb') as f:
+            return json.loads(f.read())
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
 
 @dataclass
 class AnalysisResult:
@@ -31,6 +191,87 @@ class AnalysisResult:
     recommended_actions: List[Dict[str, str]]
     playbook_used: Optional[str]
     raw_analysis: Dict
+    raw_analysis_json: Optional[str] = None  # LLM output as received, when it maps 1:1 to this result
+    
+    def analysis_json(self) -> str:
+        """JSON for the Alert.analysis column, reusing the LLM's own text when available."""
+        return self.raw_analysis_json or _json_dumps(self.raw_analysis)
+
+
+class ActionSchema(BaseModel):
+    """One recommended action in the LLM's analysis."""
+    model_config = ConfigDict(extra='allow')
+    
+    action: str = ''
+    owner: str = ''
+    priority: str = 'medium'
+    rationale: str = ''
+
+
+class AnalysisSchema(BaseModel):
+    """JSON contract for a single analysis, sent to the LLM as a tool schema."""
+    model_config = ConfigDict(extra='allow')
+    
+    summary: str = Field('Analysis completed', description="2-3 sentence executive summary of the change/news")
+    signal_type: str = Field('other', description="One of the SignalType values")
+    risk_level: str = Field('medium', description="One of: critical, high, medium, low, info")
+    risk_score: int = Field(50, description="0-100, where 100 is highest risk to Fluke")
+    confidence_score: int = Field(70, description="0-100, confidence in this analysis")
+    relevance_to_fluke: str = ''
+    key_details: List[str] = []
+    assumptions: List[str] = []
+    recommended_playbook: str = 'default'
+    immediate_actions: List[ActionSchema] = []
+    questions_to_answer: List[str] = []
+    monitoring_recommendations: str = ''
+
+
+class ItemAnalysisSchema(AnalysisSchema):
+    """Analysis of one item in a multi-item prompt."""
+    item: int = Field(description="1-based number of the analyzed item")
+
+
+class MultiAnalysisSchema(BaseModel):
+    """JSON contract for a multi-item prompt."""
+    results: List[ItemAnalysisSchema]
+
+
+def _analysis_tool(name: str, schema: type) -> Dict[str, Any]:
+    """Function tool whose arguments carry the analysis JSON."""
+    return {
+        "type": "function",
+        "function": {"name": name, "parameters": schema.model_json_schema()}
+    }
+
+
+ANALYSIS_TOOL = _analysis_tool('emit_analysis', AnalysisSchema)
+MULTI_ANALYSIS_TOOL = _analysis_tool('emit_analyses', MultiAnalysisSchema)
+
+
+@lru_cache(maxsize=8)
+def _token_encoding(model: str):
+    """
+    Tokenizer for a model, falling back to cl100k_base for unknown names (e.g. Azure deployments).
+    
+    Returns None if the encoding can't be loaded (tiktoken downloads it on
+    first use); the None is cached too, so the fetch isn't retried per prompt.
+    """
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding('cl100k_base')
+    except Exception as e:
+        logger.warning(f"Tokenizer unavailable, truncating by characters: {e}")
+        return None
+
+
+def _tool_arguments(message: Dict[str, Any]) -> str:
+    """Extract the forced tool call's JSON arguments from a chat completion message dict."""
+    tool_calls = message.get('tool_calls')
+    if tool_calls:
+        return tool_calls[0]['function']['arguments']
+    return message.get('content') or ''
 
 
 class Analyzer:
@@ -41,6 +282,7 @@ class Analyzer:
         self.fluke_context = self._load_fluke_context()
         self.playbooks = self._load_playbooks()
         self.model = os.getenv('OPENAI_MODEL', 'gpt-4-turbo-preview')
+        self.system_prompt = self._build_system_prompt()
     
     def _init_client(self):
         """Initialize the OpenAI client."""
@@ -53,18 +295,24 @@ class Analyzer:
         else:
             return OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
     
+    def _init_async_client(self):
+        """Initialize an async OpenAI client for concurrent analysis."""
+        if os.getenv('AZURE_OPENAI_ENDPOINT'):
+            return AsyncAzureOpenAI(
+                azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
+                api_key=os.getenv('AZURE_OPENAI_KEY'),
+                api_version=os.getenv('AZURE_OPENAI_API_VERSION', '2024-02-15-preview')
+            )
+        else:
+            return AsyncOpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    
     def _load_fluke_context(self) -> str:
         """Load Fluke context document."""
-        context_path = os.path.join(
-            os.path.dirname(__file__), 
-            '..', 'config', 'fluke_context.md'
-        )
-        try:
-            with open(context_path, 'r') as f:
-                return f.read()
-        except FileNotFoundError:
+        context = _read_fluke_context(FLUKE_CONTEXT_PATH, _mtime(FLUKE_CONTEXT_PATH))
+        if context is None:
             logger.warning("Fluke context file not found, using default")
             return self._get_default_fluke_context()
+        return context
     
     def _get_default_fluke_context(self) -> str:
         """Default Fluke context if file not found."""
@@ -107,16 +355,13 @@ electronic test tools, biomedical equipment, and networking solutions.
     
     def _load_playbooks(self) -> Dict:
         """Load response playbooks."""
-        playbook_path = os.path.join(
-            os.path.dirname(__file__), 
-            '..', 'config', 'playbooks.yaml'
+        playbooks = _read_playbooks(
+            PLAYBOOKS_PATH, _mtime(PLAYBOOKS_PATH), _mtime(COMPILED_PLAYBOOKS_PATH)
         )
-        try:
-            with open(playbook_path, 'r') as f:
-                return yaml.safe_load(f)
-        except FileNotFoundError:
+        if playbooks is None:
             logger.warning("Playbooks file not found, using defaults")
             return self._get_default_playbooks()
+        return playbooks
     
     def _get_default_playbooks(self) -> Dict:
         """Default playbooks if file not found."""
@@ -169,14 +414,29 @@ electronic test tools, biomedical equipment, and networking solutions.
             }
         }
     
-    def _notify_teams(self, alert: Alert) -> bool:
+    def _queue_teams_notification(self, alert: Alert):
+        """Hand a committed alert to the background Teams notifier if configured."""
+        if not os.environ.get('TEAMS_WEBHOOK_URL', ''):
+            return
+        app = current_app._get_current_object()
+        _NOTIFY_EXECUTOR.submit(self._notify_teams_in_context, app, alert.id)
+    
+    def _notify_teams_in_context(self, app, alert_id: int) -> bool:
+        """Run _notify_teams on a worker thread with its own app context and session."""
+        with app.app_context():
+            return self._notify_teams(alert_id)
+    
+    def _notify_teams(self, alert_id: int) -> bool:
         """Send alert notification to Teams if configured."""
-        import requests
-        
         webhook_url = os.environ.get('TEAMS_WEBHOOK_URL', '')
         if not webhook_url:
             return False
         
+        # Re-fetch so no session-bound object crosses threads
+        alert = db.session.get(Alert, alert_id)
+        if alert is None:
+            return False
+        
         # Check if already sent
         channels = alert.notification_channels or ''
         if 'teams' in channels:
@@ -233,7 +493,7 @@ electronic test tools, biomedical equipment, and networking solutions.
                 })
             
             # Send raw Adaptive Card directly - Power Automate flow passes it to Teams
-            response = requests.post(webhook_url, json=adaptive_card, timeout=15)
+            response = _TEAMS_SESSION.post(webhook_url, json=adaptive_card, timeout=15)
             if response.status_code in [200, 202]:
                 alert.notification_sent = True
                 alert.notification_channels = (channels + ',teams').strip(',')
@@ -244,7 +504,7 @@ electronic test tools, biomedical equipment, and networking solutions.
                 logger.warning(f"Teams webhook returned {response.status_code}")
                 return False
         except Exception as e:
-            logger.error(f"Error sending alert {alert.id} to Teams: {e}")
+            logger.error(f"Error sending alert {alert_id} to Teams: {e}")
             return False
     
     def _generate_insight(self, alert: Alert) -> bool:
@@ -263,63 +523,170 @@ electronic test tools, biomedical equipment, and networking solutions.
             logger.error(f"Error auto-generating insight for alert {alert.id}: {e}")
             return False
     
-    def _build_analysis_prompt(
-        self, 
-        content: str, 
-        competitor_name: str,
-        source_type: str,
-        additional_context: Optional[str] = None
-    ) -> str:
-        """Build the analysis prompt for the LLM."""
+    def _build_system_prompt(self) -> str:
+        """
+        Build the static system prompt shared by every analysis call.
+        
+        Everything that doesn't depend on the item lives here so the
+        provider can serve it from its prompt prefix cache.
+        """
         playbook_summary = "\n".join([
             f"- {name}: {pb.get('name', name)}"
             for name, pb in self.playbooks.get('playbooks', {}).items()
         ])
         
-        return f"""You are a competitive intelligence analyst for Fluke Corporation. 
-Analyze the following {source_type} from competitor "{competitor_name}" and provide actionable intelligence.
+        return f"""You are a competitive intelligence analyst for Fluke Corporation. Respond only with valid JSON.
 
 ## FLUKE CONTEXT
 {self.fluke_context}
 
-## CONTENT TO ANALYZE
-{content}
-
-{f"## ADDITIONAL CONTEXT{chr(10)}{additional_context}" if additional_context else ""}
-
 ## AVAILABLE RESPONSE PLAYBOOKS
 {playbook_summary}
 
-## YOUR TASK
-Analyze this content and provide a structured assessment. Be specific and actionable.
+{PRIORITY_GUIDANCE}
 
-## PRIORITY GUIDANCE
-- Partnership signals should generally be rated HIGH risk (risk_score 65-85) as they can significantly alter competitive dynamics
-- Partnerships with major tech companies (Microsoft, Google, Amazon, Siemens, Schneider Electric, etc.) should be rated HIGH (risk_score 75-90)
-- Partnerships with industry leaders or Fortune 500 companies warrant HIGH priority
-- Only rate partnerships as CRITICAL (risk_score 85+) if they directly threaten Fluke's core markets or involve exclusive deals
-- Smaller partnerships with regional distributors or niche players can remain MEDIUM (risk_score 45-65)
-
-Respond with a JSON object containing:
-{{
-    "summary": "2-3 sentence executive summary of the change/news",
-    "signal_type": "one of: product_launch, pricing_change, feature_update, partnership, acquisition, leadership_change, marketing_campaign, certification, expansion, regulatory, other",
-    "risk_level": "one of: critical, high, medium, low, info",
-    "risk_score": "0-100 integer, where 100 is highest risk to Fluke",
-    "confidence_score": "0-100 integer, your confidence in this analysis",
-    "relevance_to_fluke": "Explain specifically how this impacts Fluke's business",
-    "key_details": ["list", "of", "important", "specific", "details"],
-    "assumptions": ["list", "of", "assumptions", "you", "made"],
-    "recommended_playbook": "name of the most appropriate playbook from the list above",
-    "immediate_actions": [
-        {{"action": "specific action to take", "owner": "team/role", "priority": "high/medium/low", "rationale": "why this matters"}}
-    ],
-    "questions_to_answer": ["list", "of", "questions", "that", "need", "investigation"],
-    "monitoring_recommendations": "What should we continue to watch for?"
-}}
+## ANALYSIS FORMAT
+Each analysis is a JSON object containing:
+{ANALYSIS_RESPONSE_SPEC}
 
 Be concise but thorough. Focus on actionable intelligence."""
+    
+    def _build_analysis_prompt(
+        self, 
+        content: str, 
+        competitor_name: str,
+        source_type: str,
+        additional_context: Optional[str] = None
+    ) -> str:
+        """Build the per-item user prompt for the LLM."""
+        return ANALYSIS_PROMPT_TEMPLATE.format(
+            source_type=source_type,
+            competitor_name=competitor_name,
+            content=content,
+            additional_context=f"## ADDITIONAL CONTEXT\n{additional_context}" if additional_context else ""
+        )
+    
+    def _build_multi_item_prompt(self, requests: List[Dict[str, Any]]) -> str:
+        """Build one user prompt that asks for an analysis of each of several items."""
+        sections = []
+        for index, request in enumerate(requests, 1):
+            header = f"## ITEM {index}\n{request.get('source_type', 'update')} from competitor \"{request['competitor_name']}\""
+            if request.get('additional_context'):
+                header += f"\n{request['additional_context']}"
+            sections.append(f"{header}\n{request['content']}")
+        items = "\n\n".join(sections)
+        
+        return f"""Analyze each of the {len(requests)} items below independently and provide actionable intelligence for each.
+
+## ITEMS TO ANALYZE
+{items}
 
+Respond with a JSON object {{"results": [...]}} holding exactly one entry per item, in item order.
+Each entry must contain "item" (the item number) and the fields of an analysis object in the format above."""
+    
+    def _parse_multi_item_analysis(self, result_text: str, count: int) -> List[AnalysisResult]:
+        """Split a multi-item response into one AnalysisResult per item."""
+        entries = _json_loads(result_text).get('results', [])
+        by_item = {}
+        for position, entry in enumerate(entries, 1):
+            if isinstance(entry, dict):
+                entry.setdefault('item', position)
+                by_item[int(entry['item'])] = entry
+        
+        results = []
+        for index in range(1, count + 1):
+            try:
+                entry = ItemAnalysisSchema.model_validate(by_item[index]).model_dump()
+                results.append(self._result_from_json(entry))
+            except Exception as e:
+                logger.error(f"Missing or invalid analysis for item {index}: {e}")
+                results.append(self._error_result(e))
+        return results
+    
+    def _completion_kwargs(self, prompt: str, max_tokens: int = 2000, multi_item: bool = False) -> Dict[str, Any]:
+        """
+        Build chat completion arguments for an analysis prompt.
+        
+        The reply is forced through a tool call so the JSON follows the
+        AnalysisSchema (or MultiAnalysisSchema for multi-item prompts).
+        """
+        if os.getenv('AZURE_OPENAI_ENDPOINT'):
+            model = os.getenv('AZURE_OPENAI_DEPLOYMENT', 'gpt-4')
+        else:
+            model = self.model
+        tool = MULTI_ANALYSIS_TOOL if multi_item else ANALYSIS_TOOL
+        
+        return {
+            'model': model,
+            'messages': [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': 0.3,
+            'max_tokens': max_tokens,
+            'tools': [tool],
+            'tool_choice': {"type": "function", "function": {"name": tool['function']['name']}}
+        }
+    
+    def _parse_analysis(self, result_text: str) -> AnalysisResult:
+        """Map the LLM's JSON response onto an AnalysisResult."""
+        result = self._result_from_json(AnalysisSchema.model_validate(_json_loads(result_text)).model_dump())
+        result.raw_analysis_json = result_text
+        return result
+    
+    def _result_from_json(self, result_json: Dict) -> AnalysisResult:
+        """Build an AnalysisResult from one parsed analysis object."""
+        # Map signal type
+        signal_type = result_json.get('signal_type', 'other')
+        if signal_type not in _SIGNAL_TYPE_VALUES:
+            signal_type = SignalType.OTHER.value
+        
+        # Map risk level
+        risk_level = result_json.get('risk_level', 'medium')
+        if risk_level not in _RISK_LEVEL_VALUES:
+            risk_level = RiskLevel.MEDIUM.value
+        
+        # Get playbook actions
+        playbook_name = result_json.get('recommended_playbook', 'default')
+        playbook = self.playbooks.get('playbooks', {}).get(playbook_name, {})
+        playbook_actions = playbook.get('actions', [])
+        
+        # Combine LLM actions with playbook actions
+        immediate_actions = result_json.get('immediate_actions', [])
+        all_actions = immediate_actions + playbook_actions
+        
+        return AnalysisResult(
+            summary=result_json.get('summary', 'Analysis completed'),
+            signal_type=signal_type,
+            risk_level=risk_level,
+            risk_score=min(100, max(0, int(result_json.get('risk_score', 50)))),
+            confidence_score=min(100, max(0, int(result_json.get('confidence_score', 70)))),
+            relevance_explanation=result_json.get('relevance_to_fluke', ''),
+            assumptions=result_json.get('assumptions', []),
+            recommended_actions=all_actions,
+            playbook_used=playbook_name,
+            raw_analysis=result_json
+        )
+    
+    def _error_result(self, error: Exception) -> AnalysisResult:
+        """Default result returned when analysis fails."""
+        return AnalysisResult(
+            summary=f"Error analyzing content: {str(error)}",
+            signal_type=SignalType.OTHER.value,
+            risk_level=RiskLevel.MEDIUM.value,
+            risk_score=50,
+            confidence_score=0,
+            relevance_explanation="Analysis failed",
+            assumptions=["Analysis could not be completed"],
+            recommended_actions=[{
+                "action": "Manual review required",
+                "owner": "Competitive Intelligence",
+                "priority": "high"
+            }],
+            playbook_used=None,
+            raw_analysis={"error": str(error)}
+        )
+    
     def analyze_content(
         self,
         content: str,
@@ -339,92 +706,153 @@ Be concise but thorough. Focus on actionable intelligence."""
         Returns:
             AnalysisResult with structured analysis
         """
+        request = {
+            'content': content,
+            'competitor_name': competitor_name,
+            'source_type': source_type,
+            'additional_context': additional_context
+        }
+        cache_key = self._cache_key(request)
+        cached = self._cached_results([cache_key])
+        if cache_key in cached:
+            return cached[cache_key]
+        
         prompt = self._build_analysis_prompt(
             content, competitor_name, source_type, additional_context
         )
         
         try:
-            if os.getenv('AZURE_OPENAI_ENDPOINT'):
-                deployment = os.getenv('AZURE_OPENAI_DEPLOYMENT', 'gpt-4')
-                response = self.client.chat.completions.create(
-                    model=deployment,
-                    messages=[
-                        {"role": "system", "content": "You are a competitive intelligence analyst. Respond only with valid JSON."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.3,
-                    max_tokens=2000,
-                    response_format={"type": "json_object"}
+            response = self.client.chat.completions.create(**self._completion_kwargs(prompt))
+            result = self._parse_analysis(_tool_arguments(response.choices[0].message.model_dump()))
+            self._store_results({cache_key: result})
+            return result
+        except Exception as e:
+            logger.error(f"Error during LLM analysis: {e}")
+            # Return a default result on error
+            return self._error_result(e)
+    
+    def analyze_many(self, requests: List[Dict[str, Any]], group_size: int = 1) -> List[AnalysisResult]:
+        """
+        Run several analyses concurrently.
+        
+        Args:
+            requests: analyze_content keyword arguments, one dict per item
+            group_size: Items packed into each LLM call
+            
+        Returns:
+            AnalysisResults in the same order as requests
+        """
+        if not requests:
+            return []
+        
+        keys = [self._cache_key(request) for request in requests]
+        cached = self._cached_results(keys)
+        misses = [i for i, key in enumerate(keys) if key not in cached]
+        if cached:
+            logger.info(f"Analysis cache hits: {len(requests) - len(misses)}/{len(requests)}")
+        
+        fresh = {}
+        if misses:
+            analyses = asyncio.run(self._analyze_many_async([requests[i] for i in misses], max(1, group_size)))
+            fresh = {keys[i]: result for i, result in zip(misses, analyses)}
+            self._store_results(fresh)
+        
+        return [cached.get(key) or fresh[key] for key in keys]
+    
+    def _cache_key(self, request: Dict[str, Any]) -> str:
+        """Hash of everything that determines an analysis, with whitespace normalized."""
+        # Capture timestamps change on every snapshot, so they'd defeat the cache
+        content = '\n'.join(
+            line for line in request['content'].splitlines()
+            if not line.startswith(_VOLATILE_CONTENT_PREFIXES)
+        )
+        parts = [
+            self.model,
+            request['competitor_name'] or '',
+            request.get('source_type') or '',
+            request.get('additional_context') or '',
+            ' '.join(content.split())
+        ]
+        return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+    
+    def _cached_results(self, keys: List[str]) -> Dict[str, AnalysisResult]:
+        """Look up unexpired cached analyses by key."""
+        if not ANALYSIS_CACHE_ENABLED or not keys:
+            return {}
+        
+        cutoff = datetime.utcnow() - timedelta(days=ANALYSIS_CACHE_TTL_DAYS)
+        try:
+            rows = AnalysisCache.query.filter(
+                AnalysisCache.cache_key.in_(set(keys)),
+                AnalysisCache.created_at >= cutoff
+            ).all()
+            return {row.cache_key: self._result_from_json(_json_loads(row.result_json)) for row in rows}
+        except Exception as e:
+            logger.error(f"Error reading analysis cache: {e}")
+            return {}
+    
+    def _store_results(self, results: Dict[str, AnalysisResult]):
+        """
+        Cache successful analyses, replacing expired entries for the same key.
+        
+        Rows are flushed in a savepoint and committed with the caller's
+        transaction; a failed write only rolls back the savepoint.
+        """
+        if not ANALYSIS_CACHE_ENABLED:
+            return
+        
+        results = {k: r for k, r in results.items() if 'error' not in r.raw_analysis}
+        if not results:
+            return
+        
+        try:
+            with db.session.begin_nested():
+                AnalysisCache.query.filter(AnalysisCache.cache_key.in_(list(results))).delete(synchronize_session=False)
+                for key, result in results.items():
+                    db.session.add(AnalysisCache(cache_key=key, result_json=result.analysis_json()))
+                db.session.flush()
+        except Exception as e:
+            logger.error(f"Error writing analysis cache: {e}")
+    
+    async def _analyze_many_async(self, requests: List[Dict[str, Any]], group_size: int) -> List[AnalysisResult]:
+        """Fan request groups out over an async client, bounded by ANALYSIS_CONCURRENCY."""
+        client = self._init_async_client()
+        semaphore = asyncio.Semaphore(ANALYSIS_CONCURRENCY)
+        
+        async def run(group):
+            if len(group) == 1:
+                kwargs = group[0]
+                prompt = self._build_analysis_prompt(
+                    kwargs['content'], kwargs['competitor_name'],
+                    kwargs.get('source_type', 'update'), kwargs.get('additional_context')
                 )
+                completion = self._completion_kwargs(prompt)
             else:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are a competitive intelligence analyst. Respond only with valid JSON."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.3,
-                    max_tokens=2000,
-                    response_format={"type": "json_object"}
+                prompt = self._build_multi_item_prompt(group)
+                completion = self._completion_kwargs(
+                    prompt, max_tokens=min(4096, 1000 * len(group)), multi_item=True
                 )
             
-            result_text = response.choices[0].message.content
-            result_json = json.loads(result_text)
-            
-            # Map signal type
-            signal_type = result_json.get('signal_type', 'other')
-            if signal_type not in [st.value for st in SignalType]:
-                signal_type = SignalType.OTHER.value
-            
-            # Map risk level
-            risk_level = result_json.get('risk_level', 'medium')
-            if risk_level not in [rl.value for rl in RiskLevel]:
-                risk_level = RiskLevel.MEDIUM.value
-            
-            # Get playbook actions
-            playbook_name = result_json.get('recommended_playbook', 'default')
-            playbook = self.playbooks.get('playbooks', {}).get(playbook_name, {})
-            playbook_actions = playbook.get('actions', [])
-            
-            # Combine LLM actions with playbook actions
-            immediate_actions = result_json.get('immediate_actions', [])
-            all_actions = immediate_actions + playbook_actions
-            
-            return AnalysisResult(
-                summary=result_json.get('summary', 'Analysis completed'),
-                signal_type=signal_type,
-                risk_level=risk_level,
-                risk_score=min(100, max(0, int(result_json.get('risk_score', 50)))),
-                confidence_score=min(100, max(0, int(result_json.get('confidence_score', 70)))),
-                relevance_explanation=result_json.get('relevance_to_fluke', ''),
-                assumptions=result_json.get('assumptions', []),
-                recommended_actions=all_actions,
-                playbook_used=playbook_name,
-                raw_analysis=result_json
-            )
-            
-        except Exception as e:
-            logger.error(f"Error during LLM analysis: {e}")
-            # Return a default result on error
-            return AnalysisResult(
-                summary=f"Error analyzing content: {str(e)}",
-                signal_type=SignalType.OTHER.value,
-                risk_level=RiskLevel.MEDIUM.value,
-                risk_score=50,
-                confidence_score=0,
-                relevance_explanation="Analysis failed",
-                assumptions=["Analysis could not be completed"],
-                recommended_actions=[{
-                    "action": "Manual review required",
-                    "owner": "Competitive Intelligence",
-                    "priority": "high"
-                }],
-                playbook_used=None,
-                raw_analysis={"error": str(e)}
-            )
+            async with semaphore:
+                try:
+                    response = await client.chat.completions.create(**completion)
+                    result_text = _tool_arguments(response.choices[0].message.model_dump())
+                    if len(group) == 1:
+                        return [self._parse_analysis(result_text)]
+                    return self._parse_multi_item_analysis(result_text, len(group))
+                except Exception as e:
+                    logger.error(f"Error during LLM analysis: {e}")
+                    return [self._error_result(e) for _ in group]
+        
+        groups = [requests[i:i + group_size] for i in range(0, len(requests), group_size)]
+        try:
+            grouped = await asyncio.gather(*(run(group) for group in groups))
+        finally:
+            await client.close()
+        return [result for group_results in grouped for result in group_results]
     
-    def analyze_page_change(self, snapshot: PageSnapshot) -> Alert:
-        """Analyze a page change and create an alert."""
+    def _page_change_request(self, snapshot: PageSnapshot) -> Dict[str, Any]:
+        """Build analyze_content arguments for a page change."""
         monitored_url = snapshot.monitored_url
         competitor = monitored_url.competitor
         
@@ -439,16 +867,81 @@ Change Detected: {snapshot.captured_at}
 {snapshot.diff_summary or 'Full page content changed'}
 
 ## Current Page Content (excerpt)
-{snapshot.extracted_text[:3000] if snapshot.extracted_text else 'Content not available'}
+{self._smart_truncate(snapshot.extracted_text) if snapshot.extracted_text else 'Content not available'}
 """
         
-        # Run analysis
-        result = self.analyze_content(
-            content=content,
-            competitor_name=competitor.name,
-            source_type="page change",
-            additional_context=f"This is a {monitored_url.page_type} page"
-        )
+        return {
+            'content': content,
+            'competitor_name': competitor.name,
+            'source_type': "page change",
+            'additional_context': f"This is a {monitored_url.page_type} page"
+        }
+    
+    def _smart_truncate(self, text: str, max_tokens: int = PAGE_EXCERPT_TOKENS) -> str:
+        """Cut text to at most max_tokens tokens of the analysis model."""
+        # A token never covers less than one character
+        if not text or len(text) <= max_tokens:
+            return text
+        
+        # Only the head is kept, so don't tokenize the whole page
+        text = text[:max_tokens * 8]
+        encoding = _token_encoding(self.model)
+        if encoding is None:
+            return text[:max_tokens * 4]
+        
+        tokens = encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        return encoding.decode(tokens[:max_tokens])
+    
+    def _content_sha256(self, snapshot: PageSnapshot) -> Optional[str]:
+        """Hash of a snapshot's extracted text, used to spot page content flipping back."""
+        if not snapshot.extracted_text:
+            return None
+        return hashlib.sha256(snapshot.extracted_text.encode('utf-8')).hexdigest()
+    
+    def _repeat_snapshot_ids(self, snapshots: List[PageSnapshot]) -> set:
+        """
+        Return the IDs of snapshots whose page text already got an alert for
+        the same competitor recently, i.e. content that flipped back.
+        """
+        hashes = {snapshot.id: self._content_sha256(snapshot) for snapshot in snapshots}
+        if not any(hashes.values()):
+            return set()
+        
+        cutoff = datetime.utcnow() - timedelta(days=CONTENT_REUSE_DAYS)
+        rows = db.session.query(Alert.competitor_id, Alert.content_sha256).filter(
+            Alert.competitor_id.in_({snapshot.monitored_url.competitor_id for snapshot in snapshots}),
+            Alert.content_sha256.in_({h for h in hashes.values() if h}),
+            Alert.detected_at >= cutoff
+        ).distinct().all()
+        alerted = {(row.competitor_id, row.content_sha256) for row in rows}
+        
+        return {
+            snapshot.id for snapshot in snapshots
+            if (snapshot.monitored_url.competitor_id, hashes[snapshot.id]) in alerted
+        }
+    
+    def _skip_repeat_snapshot(self, snapshot: PageSnapshot):
+        """Take a flipped-back snapshot out of the pending queue without an alert or LLM call."""
+        logger.info(f"Skipping snapshot {snapshot.id}: identical content was already alerted")
+        # has_changes stays set: the monitor did see a change, it just needs no new alert
+        snapshot.is_repeat = True
+    
+    def _after_alert_created(self, alert: Alert):
+        """Follow-up work for a committed alert: Teams notification and insights."""
+        # Auto-send to Teams if configured (in the background)
+        self._queue_teams_notification(alert)
+        
+        # Auto-generate insight for significant alerts
+        if alert.risk_level in ['critical', 'high']:
+            self._generate_insight(alert)
+    
+    def _create_page_alert(self, snapshot: PageSnapshot, result: AnalysisResult,
+                           commit: bool = True) -> Alert:
+        """Create the alert for an analyzed page change."""
+        monitored_url = snapshot.monitored_url
+        competitor = monitored_url.competitor
         
         # Create alert
         alert = Alert(
@@ -460,35 +953,49 @@ Change Detected: {snapshot.captured_at}
             summary=result.summary,
             raw_content=snapshot.extracted_text[:10000] if snapshot.extracted_text else None,
             diff_content=snapshot.diff_summary,
+            content_sha256=self._content_sha256(snapshot),
             signal_type=result.signal_type,
             risk_level=result.risk_level,
             risk_score=result.risk_score,
             confidence_score=result.confidence_score,
-            analysis=json.dumps(result.raw_analysis),
+            analysis=result.analysis_json(),
             relevance_explanation=result.relevance_explanation,
             assumptions='\n'.join(f"• {a}" for a in result.assumptions),
-            recommended_actions=json.dumps(result.recommended_actions),
+            recommended_actions=_json_dumps(result.recommended_actions),
             playbook_used=result.playbook_used,
             status=AlertStatus.NEW.value
         )
         
         db.session.add(alert)
-        db.session.commit()
-        
-        # Auto-send to Teams if configured
-        self._notify_teams(alert)
+        if not commit:
+            return alert
         
-        # Auto-generate insight for significant alerts
-        if result.risk_level in ['critical', 'high']:
-            self._generate_insight(alert)
+        db.session.commit()
+        self._after_alert_created(alert)
         
         logger.info(f"Created alert {alert.id} for page change on {monitored_url.url}")
         return alert
     
+    def analyze_page_change(self, snapshot: PageSnapshot, commit: bool = True) -> Optional[Alert]:
+        """
+        Analyze a page change and create an alert.
+        
+        Returns None without calling the LLM when the page text flipped
+        back to content that was already alerted. With commit=False the
+        alert is only added to the session; the caller commits and then
+        runs _after_alert_created.
+        """
+        if self._repeat_snapshot_ids([snapshot]):
+            self._skip_repeat_snapshot(snapshot)
+            if commit:
+                db.session.commit()
+            return None
+        
+        result = self.analyze_content(**self._page_change_request(snapshot))
+        return self._create_page_alert(snapshot, result, commit=commit)
+    
     def _has_recent_alert(self, source_url: str, hours: int = 6) -> bool:
         """Check if an alert was created for this source URL within the specified hours."""
-        from datetime import timedelta
-        
         cutoff_time = datetime.utcnow() - timedelta(hours=hours)
         existing_alert = Alert.query.filter(
             Alert.source_url == source_url,
@@ -497,14 +1004,36 @@ Change Detected: {snapshot.captured_at}
         
         return existing_alert is not None
     
-    def analyze_news_item(self, news_item: NewsItem) -> Optional[Alert]:
-        """Analyze a news item and optionally create an alert."""
+    def _recent_alert_urls(self, source_urls: List[str], hours: int = 6) -> set:
+        """Return the subset of source URLs that got an alert within the specified hours."""
+        if not source_urls:
+            return set()
+        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
+        rows = db.session.query(Alert.source_url).filter(
+            Alert.source_url.in_(set(source_urls)),
+            Alert.detected_at >= cutoff_time
+        ).all()
+        return {row.source_url for row in rows}
+    
+    def _skip_news_item(self, news_item: NewsItem, commit: bool = True,
+                        recent_urls: Optional[set] = None) -> bool:
+        """
+        Apply the pre-analysis guards, marking skipped items as processed.
+        
+        recent_urls, when given, is a precomputed _recent_alert_urls result
+        used instead of querying per item.
+        """
         # Rate limit: Only one alert per source URL every 6 hours
-        if self._has_recent_alert(news_item.url, hours=6):
+        if recent_urls is not None:
+            rate_limited = news_item.url in recent_urls
+        else:
+            rate_limited = self._has_recent_alert(news_item.url, hours=6)
+        if rate_limited:
             logger.info(f"Skipping news item (rate limited - recent alert exists): {news_item.title[:50]}")
             news_item.is_processed = True
-            db.session.commit()
-            return None
+            if commit:
+                db.session.commit()
+            return True
         
         # Finance-news guard: skip finance/stock items before analysis
         try:
@@ -513,13 +1042,18 @@ Change Detected: {snapshot.captured_at}
             blob = " ".join(filter(None, [news_item.title, news_item.description, news_item.content])).lower()
             if any(k in blob for k in finance_keywords):
                 news_item.is_processed = True
-                db.session.commit()
+                if commit:
+                    db.session.commit()
                 logger.info("Skipped finance-related news item")
-                return None
+                return True
         except Exception:
             # If anything goes wrong, don't block processing
             pass
         
+        return False
+    
+    def _news_request(self, news_item: NewsItem) -> Dict[str, Any]:
+        """Build analyze_content arguments for a news item."""
         competitor = news_item.competitor if news_item.competitor_id else None
         competitor_name = competitor.name if competitor else "Unknown"
         
@@ -537,12 +1071,17 @@ URL: {news_item.url}
 {news_item.content or ''}
 """
         
-        # Run analysis
-        result = self.analyze_content(
-            content=content,
-            competitor_name=competitor_name,
-            source_type="news article"
-        )
+        return {
+            'content': content,
+            'competitor_name': competitor_name,
+            'source_type': "news article"
+        }
+    
+    def _record_news_result(self, news_item: NewsItem, result: AnalysisResult,
+                            commit: bool = True) -> Optional[Alert]:
+        """Mark a news item processed and create an alert if it is relevant."""
+        competitor = news_item.competitor if news_item.competitor_id else None
+        competitor_name = competitor.name if competitor else "Unknown"
         
         # Mark as processed
         news_item.is_processed = True
@@ -550,7 +1089,8 @@ URL: {news_item.url}
         
         # Only create alert if relevant enough
         if not news_item.is_relevant:
-            db.session.commit()
+            if commit:
+                db.session.commit()
             return None
         
         # Create alert
@@ -566,29 +1106,163 @@ URL: {news_item.url}
             risk_level=result.risk_level,
             risk_score=result.risk_score,
             confidence_score=result.confidence_score,
-            analysis=json.dumps(result.raw_analysis),
+            analysis=result.analysis_json(),
             relevance_explanation=result.relevance_explanation,
             assumptions='\n'.join(f"• {a}" for a in result.assumptions),
-            recommended_actions=json.dumps(result.recommended_actions),
+            recommended_actions=_json_dumps(result.recommended_actions),
             playbook_used=result.playbook_used,
             status=AlertStatus.NEW.value
         )
         
         db.session.add(alert)
-        db.session.commit()
-        
-        # Auto-send to Teams if configured
-        self._notify_teams(alert)
+        if not commit:
+            return alert
         
-        # Auto-generate insight for significant alerts
-        if result.risk_level in ['critical', 'high']:
-            self._generate_insight(alert)
+        db.session.commit()
+        self._after_alert_created(alert)
         
         logger.info(f"Created alert {alert.id} for news item: {news_item.title[:50]}")
         return alert
     
+    def analyze_news_item(self, news_item: NewsItem, commit: bool = True,
+                          recent_urls: Optional[set] = None) -> Optional[Alert]:
+        """Analyze a news item and optionally create an alert."""
+        if self._skip_news_item(news_item, commit=commit, recent_urls=recent_urls):
+            return None
+        
+        result = self.analyze_content(**self._news_request(news_item))
+        return self._record_news_result(news_item, result, commit=commit)
+    
+    def submit_news_batch(self, limit: int = 500) -> Optional[AnalysisBatch]:
+        """
+        Submit the unprocessed news backlog as one OpenAI Batch API job.
+        
+        Batch jobs are billed at half price with a 24h completion window,
+        so this suits backlogs that aren't time-sensitive. Items are marked
+        processed while the job runs and released again if it fails.
+        
+        Returns:
+            The tracking AnalysisBatch, or None if nothing was submitted
+        """
+        if os.getenv('AZURE_OPENAI_ENDPOINT'):
+            logger.warning("Batch analysis requires the OpenAI API; skipping for Azure")
+            return None
+        
+        lines = []
+        news_ids = []
+        backlog = NewsItem.query.options(
+            joinedload(NewsItem.competitor),
+            undefer(NewsItem.content)
+        ).filter_by(is_processed=False).limit(limit).all()
+        for news_item in backlog:
+            if self._skip_news_item(news_item, commit=False):
+                continue
+            request = self._news_request(news_item)
+            prompt = self._build_analysis_prompt(
+                request['content'], request['competitor_name'], request['source_type']
+            )
+            lines.append(json.dumps({
+                'custom_id': str(news_item.id),
+                'method': 'POST',
+                'url': '/v1/chat/completions',
+                'body': self._completion_kwargs(prompt)
+            }))
+            news_ids.append(news_item.id)
+            news_item.is_processed = True
+        
+        if not lines:
+            db.session.commit()
+            return None
+        
+        try:
+            input_file = self.client.files.create(
+                file=('news_batch.jsonl', '\n'.join(lines).encode('utf-8')),
+                purpose='batch'
+            )
+            batch = self.client.batches.create(
+                input_file_id=input_file.id,
+                endpoint='/v1/chat/completions',
+                completion_window='24h'
+            )
+        except Exception as e:
+            logger.error(f"Error submitting news batch: {e}")
+            db.session.rollback()
+            return None
+        
+        job = AnalysisBatch(
+            batch_id=batch.id,
+            input_file_id=input_file.id,
+            status=batch.status,
+            news_item_ids=json.dumps(news_ids)
+        )
+        db.session.add(job)
+        db.session.commit()
+        
+        logger.info(f"Submitted batch {batch.id} with {len(news_ids)} news items")
+        return job
+    
+    def poll_news_batches(self) -> Dict[str, int]:
+        """Collect finished Batch API jobs and create alerts from their results."""
+        results = {'batches_completed': 0, 'news_processed': 0, 'alerts_created': 0}
+        
+        jobs = AnalysisBatch.query.filter(~AnalysisBatch.status.in_(BATCH_DONE_STATES)).all()
+        for job in jobs:
+            try:
+                batch = self.client.batches.retrieve(job.batch_id)
+            except Exception as e:
+                logger.error(f"Error retrieving batch {job.batch_id}: {e}")
+                continue
+            
+            job.status = batch.status
+            if batch.status not in BATCH_DONE_STATES:
+                db.session.commit()
+                continue
+            
+            job.completed_at = datetime.utcnow()
+            job.output_file_id = batch.output_file_id
+            news_by_id = {
+                n.id: n for n in NewsItem.query.filter(NewsItem.id.in_(job.get_news_item_ids())).all()
+            }
+            
+            if batch.status == 'completed' and batch.output_file_id:
+                output = self.client.files.content(batch.output_file_id).text
+                for line in output.splitlines():
+                    if not line.strip():
+                        continue
+                    record = _json_loads(line)
+                    news_item = news_by_id.pop(int(record['custom_id']), None)
+                    if news_item is None:
+                        continue
+                    try:
+                        response = record.get('response') or {}
+                        if response.get('status_code') != 200:
+                            raise ValueError(record.get('error') or f"status {response.get('status_code')}")
+                        content = _tool_arguments(response['body']['choices'][0]['message'])
+                        alert = self._record_news_result(news_item, self._parse_analysis(content))
+                        results['news_processed'] += 1
+                        if alert:
+                            results['alerts_created'] += 1
+                    except Exception as e:
+                        logger.error(f"Error processing batch result for news item {news_item.id}: {e}")
+                        news_item.is_processed = False
+            
+            # Anything without a usable result goes back to the real-time queue
+            for news_item in news_by_id.values():
+                news_item.is_processed = False
+            
+            db.session.commit()
+            results['batches_completed'] += 1
+            logger.info(f"Batch {job.batch_id} finished with status {batch.status}")
+        
+        return results
+    
     def process_pending_items(self, max_alerts_per_run: int = 5) -> Dict[str, int]:
-        """Process all pending page changes and news items with rate limiting."""
+        """
+        Process all pending page changes and news items with rate limiting.
+        
+        LLM calls for each batch run concurrently via analyze_many; alerts
+        are then added in the original order and committed once at the end.
+        """
         results = {
             'page_changes_processed': 0,
             'news_processed': 0,
@@ -597,7 +1271,6 @@ URL: {news_item.url}
         }
         
         # Check how many alerts were created in the last 24 hours
-        from datetime import timedelta
         cutoff = datetime.utcnow() - timedelta(hours=24)
         recent_alerts_count = Alert.query.filter(Alert.detected_at >= cutoff).count()
         max_daily_alerts = int(os.getenv('MAX_DAILY_ALERTS', 10))
@@ -607,51 +1280,115 @@ URL: {news_item.url}
             return results
         
         remaining_alerts = min(max_alerts_per_run, max_daily_alerts - recent_alerts_count)
+        created_alerts = []
+        
+        try:
+            self._process_pending_snapshots(remaining_alerts, results, created_alerts)
+            
+            if results['alerts_created'] >= remaining_alerts:
+                logger.info("Alert limit reached, skipping news processing")
+            else:
+                self._process_pending_news(remaining_alerts, results, created_alerts)
+            
+            db.session.commit()
+        except Exception as e:
+            logger.error(f"Error committing processed items: {e}")
+            db.session.rollback()
+            results['alerts_created'] = 0
+            return results
+        
+        for alert in created_alerts:
+            logger.info(f"Created alert {alert.id}: {alert.title[:50]}")
+            self._after_alert_created(alert)
+        
+        logger.info(f"Processed: {results['page_changes_processed']} pages, {results['news_processed']} news, created {results['alerts_created']} alerts")
+        return results
+    
+    def _process_pending_snapshots(self, remaining_alerts: int, results: Dict[str, int],
+                                   created_alerts: List[Alert]):
+        """Analyze page changes that don't have alerts yet, without committing."""
+        unprocessed_snapshots = PageSnapshot.query.options(
+            joinedload(PageSnapshot.monitored_url).joinedload(MonitoredURL.competitor),
+            undefer(PageSnapshot.extracted_text)
+        ).filter(
+            PageSnapshot.has_changes == True,
+            PageSnapshot.is_repeat.isnot(True),
+            ~exists().where(
+                (Alert.source_type == 'page_change') & (Alert.source_id == PageSnapshot.id)
+            )
+        ).limit(remaining_alerts).all()
         
-        # Process page changes that don't have alerts yet
-        unprocessed_snapshots = PageSnapshot.query.filter(
-            PageSnapshot.has_changes == True
-        ).outerjoin(
-            Alert, 
-            (Alert.source_type == 'page_change') & (Alert.source_id == PageSnapshot.id)
-        ).filter(Alert.id == None).limit(remaining_alerts).all()
+        repeat_ids = self._repeat_snapshot_ids(unprocessed_snapshots)
+        snapshot_batch = []
+        for snapshot in unprocessed_snapshots:
+            try:
+                if snapshot.id in repeat_ids:
+                    self._skip_repeat_snapshot(snapshot)
+                    results['page_changes_processed'] += 1
+                else:
+                    snapshot_batch.append((snapshot, self._page_change_request(snapshot)))
+            except Exception as e:
+                logger.error(f"Error processing snapshot {snapshot.id}: {e}")
+        
+        analyses = self.analyze_many([request for _, request in snapshot_batch])
+        results_by_id = {snapshot.id: result for (snapshot, _), result in zip(snapshot_batch, analyses)}
         
         for snapshot in unprocessed_snapshots:
-            if results['alerts_created'] >= remaining_alerts:
-                results['skipped_rate_limit'] += 1
+            result = results_by_id.get(snapshot.id)
+            if result is None:
                 continue
             try:
-                alert = self.analyze_page_change(snapshot)
+                created_alerts.append(self._create_page_alert(snapshot, result, commit=False))
                 results['page_changes_processed'] += 1
                 results['alerts_created'] += 1
             except Exception as e:
                 logger.error(f"Error processing snapshot {snapshot.id}: {e}")
-        
-        # Process unprocessed news items (limit to prevent flooding)
+    
+    def _process_pending_news(self, remaining_alerts: int, results: Dict[str, int],
+                              created_alerts: List[Alert]):
+        """Analyze unprocessed news items (limited to prevent flooding), without committing."""
         remaining = remaining_alerts - results['alerts_created']
-        if remaining <= 0:
-            logger.info("Alert limit reached, skipping news processing")
-            return results
-            
-        unprocessed_news = NewsItem.query.filter_by(is_processed=False).limit(remaining * 3).all()
+        unprocessed_news = NewsItem.query.options(
+            joinedload(NewsItem.competitor),
+            undefer(NewsItem.content)
+        ).filter_by(is_processed=False).limit(remaining * 3).all()
+        recent_urls = self._recent_alert_urls([n.url for n in unprocessed_news], hours=6)
         
-        for news_item in unprocessed_news:
-            if results['alerts_created'] >= remaining_alerts:
-                # Mark as processed to avoid reprocessing
-                news_item.is_processed = True
-                db.session.commit()
-                results['skipped_rate_limit'] += 1
-                continue
-            try:
-                alert = self.analyze_news_item(news_item)
-                results['news_processed'] += 1
-                if alert:
-                    results['alerts_created'] += 1
-            except Exception as e:
-                logger.error(f"Error processing news item {news_item.id}: {e}")
+        # Analyze in waves sized to the open alert slots, so no LLM call is
+        # spent on an item that the alert limit would skip anyway
+        queued_urls = set()
+        next_index = 0
+        while next_index < len(unprocessed_news) and results['alerts_created'] < remaining_alerts:
+            open_slots = remaining_alerts - results['alerts_created']
+            wave = []
+            while next_index < len(unprocessed_news) and len(wave) < open_slots:
+                news_item = unprocessed_news[next_index]
+                next_index += 1
+                try:
+                    if news_item.url in queued_urls or self._skip_news_item(news_item, commit=False, recent_urls=recent_urls):
+                        news_item.is_processed = True
+                        results['news_processed'] += 1
+                        continue
+                    queued_urls.add(news_item.url)
+                    wave.append((news_item, self._news_request(news_item)))
+                except Exception as e:
+                    logger.error(f"Error processing news item {news_item.id}: {e}")
+            
+            analyses = self.analyze_many([request for _, request in wave], group_size=NEWS_ITEMS_PER_PROMPT)
+            for (news_item, _), result in zip(wave, analyses):
+                try:
+                    alert = self._record_news_result(news_item, result, commit=False)
+                    results['news_processed'] += 1
+                    if alert:
+                        created_alerts.append(alert)
+                        results['alerts_created'] += 1
+                except Exception as e:
+                    logger.error(f"Error processing news item {news_item.id}: {e}")
         
-        logger.info(f"Processed: {results['page_changes_processed']} pages, {results['news_processed']} news, created {results['alerts_created']} alerts")
-        return results
+        for news_item in unprocessed_news[next_index:]:
+            # Mark as processed to avoid reprocessing
+            news_item.is_processed = True
+            results['skipped_rate_limit'] += 1
 
 
 def run_analyzer():
@@ -0,0 +1,51 @@
+"""
+Config Compiler
+Pre-compiles YAML config files to JSON, which loads much faster at runtime.
+
+Usage: python -m app.compile_configs
+"""
+import os
+import json
+import logging
+import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+logger = logging.getLogger(__name__)
+
+CONFIG_DIR = os.path.join(os.path.dirname(__file__), '..', 'config')
+
+# YAML files read on every Analyzer startup
+COMPILED_CONFIGS = ['playbooks.yaml']
+
+
+def compile_config(yaml_path: str) -> str:
+    """Compile a YAML file to a JSON file next to it and return its path."""
+    json_path = os.path.splitext(yaml_path)[0] + '.json'
+    
+    with open(yaml_path, 'r') as f:
+        data = yaml.load(f, Loader=_YamlLoader)
+    
+    with open(json_path, 'w') as f:
+        json.dump(data, f, ensure_ascii=False)
+    
+    return json_path
+
+
+def compile_all() -> list:
+    """Compile every config in COMPILED_CONFIGS that exists."""
+    compiled = []
+    for name in COMPILED_CONFIGS:
+        yaml_path = os.path.join(CONFIG_DIR, name)
+        if os.path.exists(yaml_path):
+            compiled.append(compile_config(yaml_path))
+            logger.info(f"Compiled {name}")
+    return compiled
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    compile_all()
@@ -2,13 +2,68 @@
 Database Models for Competitor Monitor
 """
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect
 from datetime import datetime
 from enum import Enum
+import copy
 import json
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 db = SQLAlchemy()
 
 
+def _json_column(instance, column, default=None, copy_result=False):
+    """
+    Parse a JSON-encoded Text column, caching the result on the instance.
+    
+    The cache is keyed on the raw column value, so assigning new JSON to the
+    column is picked up on the next call. The cached object itself is
+    returned and must be treated as read-only; copy_result=True hands out a
+    deep copy for callers that may modify it.
+    """
+    raw = getattr(instance, column)
+    if not raw:
+        return default
+    
+    cache = instance.__dict__.setdefault('_json_cache', {})
+    cached = cache.get(column)
+    if cached is not None and cached[0] is raw:
+        value = cached[1]
+    else:
+        value = _json_loads(raw)
+        cache[column] = (raw, value)
+    return copy.deepcopy(value) if copy_result else value
+
+
+class BulkInsertMixin:
+    """Insert many rows with one executemany instead of one ORM flush per object."""
+    
+    @classmethod
+    def bulk_insert(cls, rows, returning=False):
+        """
+        Insert column dicts in a single statement.
+        
+        Args:
+            rows: List of {column: value} dicts
+            returning: If True, return the inserted rows as ORM objects
+        
+        Returns:
+            The inserted objects if returning, otherwise an empty list
+        """
+        if not rows:
+            return []
+        stmt = db.insert(cls)
+        if returning:
+            return list(db.session.scalars(stmt.returning(cls), rows))
+        db.session.execute(stmt, rows)
+        return []
+
+
 class SignalType(str, Enum):
     """Types of competitive signals detected."""
     PRODUCT_LAUNCH = "product_launch"
@@ -33,6 +88,16 @@ class RiskLevel(str, Enum):
     INFO = "info"
 
 
+# Ordinal priority per risk level, for threshold comparisons
+RISK_PRIORITY = {
+    RiskLevel.CRITICAL.value: 5,
+    RiskLevel.HIGH.value: 4,
+    RiskLevel.MEDIUM.value: 3,
+    RiskLevel.LOW.value: 2,
+    RiskLevel.INFO.value: 1
+}
+
+
 class AlertStatus(str, Enum):
     """Status of an alert."""
     NEW = "new"
@@ -55,11 +120,34 @@ class Competitor(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Relationships
-    monitored_urls = db.relationship('MonitoredURL', backref='competitor', lazy='dynamic')
-    alerts = db.relationship('Alert', backref='competitor', lazy='dynamic')
+    # Relationships (alerts stay dynamic: callers filter and page them)
+    monitored_urls = db.relationship('MonitoredURL', back_populates='competitor')
+    alerts = db.relationship('Alert', back_populates='competitor', lazy='dynamic')
     
-    def to_dict(self):
+    @classmethod
+    def list_with_counts(cls):
+        """
+        Load all competitors with their URL and new-alert counts in one query.
+        
+        Returns:
+            List of (competitor, url_count, alert_count) tuples
+        """
+        url_count = db.select(db.func.count(MonitoredURL.id)).where(
+            MonitoredURL.competitor_id == cls.id
+        ).correlate(cls).scalar_subquery()
+        alert_count = db.select(db.func.count(Alert.id)).where(
+            Alert.competitor_id == cls.id,
+            Alert.status == AlertStatus.NEW.value
+        ).correlate(cls).scalar_subquery()
+        
+        return db.session.query(cls, url_count, alert_count).all()
+    
+    def to_dict(self, url_count=None, alert_count=None):
+        if url_count is None:
+            url_count = len(self.monitored_urls)
+        if alert_count is None:
+            alert_count = self.alerts.filter_by(status=AlertStatus.NEW.value).count()
+        
         return {
             'id': self.id,
             'name': self.name,
@@ -67,15 +155,19 @@ class Competitor(db.Model):
             'website': self.website,
             'logo_url': self.logo_url,
             'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'url_count': self.monitored_urls.count(),
-            'alert_count': self.alerts.filter_by(status=AlertStatus.NEW.value).count()
+            'created_at': self.created_at,
+            'url_count': url_count,
+            'alert_count': alert_count
         }
 
 
 class MonitoredURL(db.Model):
     """URLs being monitored for changes."""
     __tablename__ = 'monitored_urls'
+    __table_args__ = (
+        db.Index('ix_monitored_urls_due', 'is_active', 'last_checked_at'),
+        db.Index('ix_monitored_urls_hash', 'last_content_hash'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     competitor_id = db.Column(db.Integer, db.ForeignKey('competitors.id'), nullable=False)
@@ -87,7 +179,7 @@ class MonitoredURL(db.Model):
     check_interval_hours = db.Column(db.Integer, default=24)
     last_checked_at = db.Column(db.DateTime)
     last_content_hash = db.Column(db.String(64))
-    last_content = db.Column(db.Text)
+    last_content = db.deferred(db.Column(db.Text))
     
     # Status
     is_active = db.Column(db.Boolean, default=True)
@@ -97,7 +189,8 @@ class MonitoredURL(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Relationships
+    # Relationships (snapshots stay dynamic: the history grows without bound)
+    competitor = db.relationship('Competitor', back_populates='monitored_urls')
     snapshots = db.relationship('PageSnapshot', backref='monitored_url', lazy='dynamic')
     
     def to_dict(self):
@@ -108,27 +201,31 @@ class MonitoredURL(db.Model):
             'name': self.name,
             'page_type': self.page_type,
             'check_interval_hours': self.check_interval_hours,
-            'last_checked_at': self.last_checked_at.isoformat() if self.last_checked_at else None,
+            'last_checked_at': self.last_checked_at,
             'is_active': self.is_active,
             'last_error': self.last_error,
             'consecutive_errors': self.consecutive_errors
         }
 
 
-class PageSnapshot(db.Model):
+class PageSnapshot(BulkInsertMixin, db.Model):
     """Historical snapshots of monitored pages."""
     __tablename__ = 'page_snapshots'
+    __table_args__ = (
+        db.Index('ix_page_snapshots_url_captured', 'monitored_url_id', 'captured_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     monitored_url_id = db.Column(db.Integer, db.ForeignKey('monitored_urls.id'), nullable=False)
     
     content_hash = db.Column(db.String(64), nullable=False)
-    content = db.Column(db.Text)
-    extracted_text = db.Column(db.Text)
+    content = db.deferred(db.Column(db.Text))
+    extracted_text = db.deferred(db.Column(db.Text))
     
     # Change detection
     has_changes = db.Column(db.Boolean, default=False)
     diff_summary = db.Column(db.Text)
+    is_repeat = db.Column(db.Boolean, default=False)  # Text matched a recent alert, so no analysis
     
     captured_at = db.Column(db.DateTime, default=datetime.utcnow)
     
@@ -139,13 +236,16 @@ class PageSnapshot(db.Model):
             'content_hash': self.content_hash,
             'has_changes': self.has_changes,
             'diff_summary': self.diff_summary,
-            'captured_at': self.captured_at.isoformat() if self.captured_at else None
+            'captured_at': self.captured_at
         }
 
 
-class NewsItem(db.Model):
+class NewsItem(BulkInsertMixin, db.Model):
     """News articles and mentions collected."""
     __tablename__ = 'news_items'
+    __table_args__ = (
+        db.Index('ix_news_competitor_published', 'competitor_id', 'published_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     competitor_id = db.Column(db.Integer, db.ForeignKey('competitors.id'))
@@ -153,7 +253,7 @@ class NewsItem(db.Model):
     title = db.Column(db.String(500), nullable=False)
     description = db.Column(db.Text)
     summary = db.Column(db.Text)  # Brief summary for display
-    content = db.Column(db.Text)
+    content = db.deferred(db.Column(db.Text))
     url = db.Column(db.String(1000))
     source = db.Column(db.String(255))
     source_type = db.Column(db.String(50))  # rss, newsapi, google_news, manual
@@ -183,8 +283,8 @@ class NewsItem(db.Model):
             'source_type': self.source_type,
             'category': self.category,
             'author': self.author,
-            'published_at': self.published_at.isoformat() if self.published_at else None,
-            'collected_at': self.collected_at.isoformat() if self.collected_at else None,
+            'published_at': self.published_at,
+            'collected_at': self.collected_at,
             'is_processed': self.is_processed,
             'is_relevant': self.is_relevant
         }
@@ -192,9 +292,17 @@ class NewsItem(db.Model):
 class Alert(db.Model):
     """Alerts generated from detected changes."""
     __tablename__ = 'alerts'
+    __table_args__ = (
+        db.Index('ix_alerts_pending_risk', 'notification_sent', 'risk_level', 'risk_score'),
+        db.Index('ix_alerts_source', 'source_type', 'source_id'),
+        db.Index('ix_alerts_competitor_content', 'competitor_id', 'content_sha256'),
+        db.Index('ix_alerts_competitor_status', 'competitor_id', 'status'),
+        db.Index('ix_alerts_status_detected', 'status', 'detected_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     competitor_id = db.Column(db.Integer, db.ForeignKey('competitors.id'), nullable=False)
+    competitor_name = db.Column(db.String(255))  # Denormalized copy of Competitor.name
     
     # Source reference
     source_type = db.Column(db.String(50))  # 'page_change', 'news', 'manual'
@@ -204,14 +312,16 @@ class Alert(db.Model):
     # Alert content
     title = db.Column(db.String(500), nullable=False)
     summary = db.Column(db.Text)
-    raw_content = db.Column(db.Text)
-    diff_content = db.Column(db.Text)
+    # Large text, only read by detail views and analysis: loaded on first access
+    raw_content = db.deferred(db.Column(db.Text))
+    diff_content = db.deferred(db.Column(db.Text))
+    content_sha256 = db.Column(db.String(64))  # Hash of the analyzed page text
     
     # Classification
     signal_type = db.Column(db.String(50))
     risk_level = db.Column(db.String(20))
-    risk_score = db.Column(db.Integer)  # 0-100
-    confidence_score = db.Column(db.Integer)  # 0-100
+    risk_score = db.Column(db.SmallInteger)  # 0-100
+    confidence_score = db.Column(db.SmallInteger)  # 0-100
     
     # LLM Analysis
     analysis = db.Column(db.Text)  # JSON with full LLM analysis
@@ -231,16 +341,20 @@ class Alert(db.Model):
     detected_at = db.Column(db.DateTime, default=datetime.utcnow)
     acknowledged_at = db.Column(db.DateTime)
     resolved_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Notification tracking
     notification_sent = db.Column(db.Boolean, default=False)
     notification_channels = db.Column(db.String(255))  # comma-separated
     
+    # Relationships
+    competitor = db.relationship('Competitor', back_populates='alerts')
+    
     def to_dict(self):
         return {
             'id': self.id,
             'competitor_id': self.competitor_id,
-            'competitor_name': self.competitor.name if self.competitor else None,
+            'competitor_name': self.competitor_name or (self.competitor.name if self.competitor else None),
             'source_type': self.source_type,
             'source_url': self.source_url,
             'title': self.title,
@@ -249,32 +363,28 @@ class Alert(db.Model):
             'risk_level': self.risk_level,
             'risk_score': self.risk_score,
             'confidence_score': self.confidence_score,
-            'analysis': json.loads(self.analysis) if self.analysis else None,
+            'analysis': _json_column(self, 'analysis', None),
             'relevance_explanation': self.relevance_explanation,
             'assumptions': self.assumptions,
-            'recommended_actions': json.loads(self.recommended_actions) if self.recommended_actions else None,
+            'recommended_actions': _json_column(self, 'recommended_actions', None),
             'playbook_used': self.playbook_used,
             'status': self.status,
             'assigned_to': self.assigned_to,
-            'detected_at': self.detected_at.isoformat() if self.detected_at else None,
-            'acknowledged_at': self.acknowledged_at.isoformat() if self.acknowledged_at else None,
-            'resolved_at': self.resolved_at.isoformat() if self.resolved_at else None
+            'detected_at': self.detected_at,
+            'acknowledged_at': self.acknowledged_at,
+            'resolved_at': self.resolved_at
         }
     
     def get_analysis(self):
         """Get parsed analysis JSON."""
-        if self.analysis:
-            return json.loads(self.analysis)
-        return {}
+        return _json_column(self, 'analysis', {}, copy_result=True)
     
     def get_recommended_actions(self):
         """Get parsed recommended actions."""
-        if self.recommended_actions:
-            return json.loads(self.recommended_actions)
-        return []
+        return _json_column(self, 'recommended_actions', [], copy_result=True)
 
 
-class AuditLog(db.Model):
+class AuditLog(BulkInsertMixin, db.Model):
     """Audit log for tracking all activities."""
     __tablename__ = 'audit_logs'
     
@@ -295,10 +405,47 @@ class AuditLog(db.Model):
             'entity_id': self.entity_id,
             'details': self.details,
             'user': self.user,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
+        }
+
+
+class AnalysisBatch(db.Model):
+    """OpenAI Batch API job analyzing a backlog of news items."""
+    __tablename__ = 'analysis_batches'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    batch_id = db.Column(db.String(100), unique=True, nullable=False)
+    input_file_id = db.Column(db.String(100))
+    output_file_id = db.Column(db.String(100))
+    status = db.Column(db.String(50), default='validating')
+    news_item_ids = db.Column(db.Text)  # JSON array
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    completed_at = db.Column(db.DateTime)
+    
+    def get_news_item_ids(self):
+        return _json_column(self, 'news_item_ids', [], copy_result=True)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'batch_id': self.batch_id,
+            'status': self.status,
+            'news_item_count': len(self.get_news_item_ids()),
+            'created_at': self.created_at,
+            'completed_at': self.completed_at
         }
 
 
+class AnalysisCache(db.Model):
+    """LLM analyses keyed by a hash of the analyzed content, for reuse on repeats."""
+    __tablename__ = 'analysis_cache'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    cache_key = db.Column(db.String(64), unique=True, nullable=False, index=True)
+    result_json = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
 class TeamType(str, Enum):
     """Teams that receive insights."""
     SALES = "sales"
@@ -310,6 +457,16 @@ class TeamType(str, Enum):
     SUPPORT = "support"
 
 
+# Insight column holding each team's JSON recommendations
+_TEAM_ATTR = {
+    'sales': 'sales_insights',
+    'marketing': 'marketing_insights',
+    'product': 'product_insights',
+    'engineering': 'engineering_insights',
+    'executive': 'executive_insights'
+}
+
+
 class Insight(db.Model):
     """AI-generated insights with team-specific recommendations."""
     __tablename__ = 'insights'
@@ -320,6 +477,7 @@ class Insight(db.Model):
     alert_id = db.Column(db.Integer, db.ForeignKey('alerts.id'))
     news_item_id = db.Column(db.Integer, db.ForeignKey('news_items.id'))
     competitor_id = db.Column(db.Integer, db.ForeignKey('competitors.id'))
+    competitor_name = db.Column(db.String(255))  # Denormalized copy of Competitor.name
     
     # Insight content
     title = db.Column(db.String(500), nullable=False)
@@ -347,9 +505,9 @@ class Insight(db.Model):
     long_term_actions = db.Column(db.Text)  # JSON array
     
     # Metadata
-    impact_score = db.Column(db.Integer)  # 0-100
-    urgency_score = db.Column(db.Integer)  # 0-100
-    confidence_score = db.Column(db.Integer)  # 0-100
+    impact_score = db.Column(db.SmallInteger)  # 0-100
+    urgency_score = db.Column(db.SmallInteger)  # 0-100
+    confidence_score = db.Column(db.SmallInteger)  # 0-100
     
     # Status
     is_reviewed = db.Column(db.Boolean, default=False)
@@ -371,45 +529,38 @@ class Insight(db.Model):
             'alert_id': self.alert_id,
             'news_item_id': self.news_item_id,
             'competitor_id': self.competitor_id,
-            'competitor_name': self.competitor.name if self.competitor else None,
+            'competitor_name': self.competitor_name or (self.competitor.name if self.competitor else None),
             'title': self.title,
             'executive_summary': self.executive_summary,
             'competitor_product': self.competitor_product,
             'fluke_product': self.fluke_product,
             'comparison_summary': self.comparison_summary,
-            'competitor_advantages': json.loads(self.competitor_advantages) if self.competitor_advantages else [],
-            'fluke_advantages': json.loads(self.fluke_advantages) if self.fluke_advantages else [],
+            'competitor_advantages': _json_column(self, 'competitor_advantages', []),
+            'fluke_advantages': _json_column(self, 'fluke_advantages', []),
             'pricing_comparison': self.pricing_comparison,
-            'feature_comparison': json.loads(self.feature_comparison) if self.feature_comparison else {},
-            'sales_insights': json.loads(self.sales_insights) if self.sales_insights else {},
-            'marketing_insights': json.loads(self.marketing_insights) if self.marketing_insights else {},
-            'product_insights': json.loads(self.product_insights) if self.product_insights else {},
-            'engineering_insights': json.loads(self.engineering_insights) if self.engineering_insights else {},
-            'executive_insights': json.loads(self.executive_insights) if self.executive_insights else {},
-            'immediate_actions': json.loads(self.immediate_actions) if self.immediate_actions else [],
-            'short_term_actions': json.loads(self.short_term_actions) if self.short_term_actions else [],
-            'long_term_actions': json.loads(self.long_term_actions) if self.long_term_actions else [],
+            'feature_comparison': _json_column(self, 'feature_comparison', {}),
+            'sales_insights': _json_column(self, 'sales_insights', {}),
+            'marketing_insights': _json_column(self, 'marketing_insights', {}),
+            'product_insights': _json_column(self, 'product_insights', {}),
+            'engineering_insights': _json_column(self, 'engineering_insights', {}),
+            'executive_insights': _json_column(self, 'executive_insights', {}),
+            'immediate_actions': _json_column(self, 'immediate_actions', []),
+            'short_term_actions': _json_column(self, 'short_term_actions', []),
+            'long_term_actions': _json_column(self, 'long_term_actions', []),
             'impact_score': self.impact_score,
             'urgency_score': self.urgency_score,
             'confidence_score': self.confidence_score,
             'is_reviewed': self.is_reviewed,
             'reviewed_by': self.reviewed_by,
-            'reviewed_at': self.reviewed_at.isoformat() if self.reviewed_at else None,
+            'reviewed_at': self.reviewed_at,
             'notes': self.notes,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
     
     def get_team_insights(self, team: str):
         """Get insights for a specific team."""
-        team_map = {
-            'sales': self.sales_insights,
-            'marketing': self.marketing_insights,
-            'product': self.product_insights,
-            'engineering': self.engineering_insights,
-            'executive': self.executive_insights
-        }
-        data = team_map.get(team.lower())
-        return json.loads(data) if data else {}
+        column = _TEAM_ATTR.get(team) or _TEAM_ATTR.get(team.lower())
+        return _json_column(self, column, {}, copy_result=True) if column else {}
 
 
 # =============================================================================
@@ -425,6 +576,7 @@ class BattleCard(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     competitor_id = db.Column(db.Integer, db.ForeignKey('competitors.id'), nullable=False)
+    competitor_name = db.Column(db.String(255))  # Denormalized copy of Competitor.name
     
     # Card metadata
     name = db.Column(db.String(255), nullable=False)
@@ -470,26 +622,26 @@ class BattleCard(db.Model):
         return {
             'id': self.id,
             'competitor_id': self.competitor_id,
-            'competitor_name': self.competitor.name if self.competitor else None,
+            'competitor_name': self.competitor_name or (self.competitor.name if self.competitor else None),
             'name': self.name,
             'version': self.version,
             'status': self.status,
             'elevator_pitch': self.elevator_pitch,
             'target_segment': self.target_segment,
-            'our_strengths': json.loads(self.our_strengths) if self.our_strengths else [],
-            'our_weaknesses': json.loads(self.our_weaknesses) if self.our_weaknesses else [],
-            'competitor_strengths': json.loads(self.competitor_strengths) if self.competitor_strengths else [],
-            'competitor_weaknesses': json.loads(self.competitor_weaknesses) if self.competitor_weaknesses else [],
-            'key_differentiators': json.loads(self.key_differentiators) if self.key_differentiators else [],
-            'trap_questions': json.loads(self.trap_questions) if self.trap_questions else [],
-            'landmine_questions': json.loads(self.landmine_questions) if self.landmine_questions else [],
-            'common_objections': json.loads(self.common_objections) if self.common_objections else [],
-            'customer_wins': json.loads(self.customer_wins) if self.customer_wins else [],
-            'pricing_comparison': json.loads(self.pricing_comparison) if self.pricing_comparison else {},
-            'feature_comparison': json.loads(self.feature_comparison) if self.feature_comparison else {},
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'last_reviewed_at': self.last_reviewed_at.isoformat() if self.last_reviewed_at else None
+            'our_strengths': _json_column(self, 'our_strengths', []),
+            'our_weaknesses': _json_column(self, 'our_weaknesses', []),
+            'competitor_strengths': _json_column(self, 'competitor_strengths', []),
+            'competitor_weaknesses': _json_column(self, 'competitor_weaknesses', []),
+            'key_differentiators': _json_column(self, 'key_differentiators', []),
+            'trap_questions': _json_column(self, 'trap_questions', []),
+            'landmine_questions': _json_column(self, 'landmine_questions', []),
+            'common_objections': _json_column(self, 'common_objections', []),
+            'customer_wins': _json_column(self, 'customer_wins', []),
+            'pricing_comparison': _json_column(self, 'pricing_comparison', {}),
+            'feature_comparison': _json_column(self, 'feature_comparison', {}),
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'last_reviewed_at': self.last_reviewed_at
         }
 
 
@@ -506,6 +658,7 @@ class WinLossRecord(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     competitor_id = db.Column(db.Integer, db.ForeignKey('competitors.id'))
+    competitor_name = db.Column(db.String(255))  # Denormalized copy of Competitor.name
     
     # Deal Info
     deal_name = db.Column(db.String(500))
@@ -553,24 +706,24 @@ class WinLossRecord(db.Model):
         return {
             'id': self.id,
             'competitor_id': self.competitor_id,
-            'competitor_name': self.competitor.name if self.competitor else None,
+            'competitor_name': self.competitor_name or (self.competitor.name if self.competitor else None),
             'deal_name': self.deal_name,
             'deal_value': self.deal_value,
             'deal_currency': self.deal_currency,
             'outcome': self.outcome,
-            'outcome_date': self.outcome_date.isoformat() if self.outcome_date else None,
+            'outcome_date': self.outcome_date,
             'customer_name': self.customer_name,
             'customer_industry': self.customer_industry,
             'customer_size': self.customer_size,
             'customer_region': self.customer_region,
             'primary_loss_reason': self.primary_loss_reason,
-            'loss_reasons': json.loads(self.loss_reasons) if self.loss_reasons else [],
-            'win_reasons': json.loads(self.win_reasons) if self.win_reasons else [],
-            'decision_makers': json.loads(self.decision_makers) if self.decision_makers else [],
+            'loss_reasons': _json_column(self, 'loss_reasons', []),
+            'win_reasons': _json_column(self, 'win_reasons', []),
+            'decision_makers': _json_column(self, 'decision_makers', []),
             'competitor_positioning': self.competitor_positioning,
             'key_learnings': self.key_learnings,
             'sales_rep': self.sales_rep,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
 
@@ -612,7 +765,7 @@ class CompetitivePlaybook(db.Model):
     
     # Metadata
     is_active = db.Column(db.Boolean, default=True)
-    priority = db.Column(db.Integer, default=5)  # 1-10
+    priority = db.Column(db.SmallInteger, default=5)  # 1-10
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -622,17 +775,17 @@ class CompetitivePlaybook(db.Model):
             'name': self.name,
             'slug': self.slug,
             'description': self.description,
-            'trigger_signal_types': json.loads(self.trigger_signal_types) if self.trigger_signal_types else [],
-            'trigger_keywords': json.loads(self.trigger_keywords) if self.trigger_keywords else [],
-            'sales_actions': json.loads(self.sales_actions) if self.sales_actions else [],
-            'marketing_actions': json.loads(self.marketing_actions) if self.marketing_actions else [],
-            'product_actions': json.loads(self.product_actions) if self.product_actions else [],
-            'executive_actions': json.loads(self.executive_actions) if self.executive_actions else [],
-            'email_templates': json.loads(self.email_templates) if self.email_templates else [],
-            'talk_tracks': json.loads(self.talk_tracks) if self.talk_tracks else [],
+            'trigger_signal_types': _json_column(self, 'trigger_signal_types', []),
+            'trigger_keywords': _json_column(self, 'trigger_keywords', []),
+            'sales_actions': _json_column(self, 'sales_actions', []),
+            'marketing_actions': _json_column(self, 'marketing_actions', []),
+            'product_actions': _json_column(self, 'product_actions', []),
+            'executive_actions': _json_column(self, 'executive_actions', []),
+            'email_templates': _json_column(self, 'email_templates', []),
+            'talk_tracks': _json_column(self, 'talk_tracks', []),
             'is_active': self.is_active,
             'priority': self.priority,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
 
@@ -646,6 +799,10 @@ class TrackedAccount(db.Model):
     Track specific high-value accounts and competitive activity.
     """
     __tablename__ = 'tracked_accounts'
+    __table_args__ = (
+        db.Index('ix_tracked_accounts_tier_stage', 'account_tier', 'deal_stage'),
+        db.Index('ix_tracked_accounts_incumbent', 'incumbent_competitor_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     
@@ -702,19 +859,22 @@ class TrackedAccount(db.Model):
             'account_owner': self.account_owner,
             'incumbent_competitor_id': self.incumbent_competitor_id,
             'incumbent_name': self.incumbent.name if self.incumbent else None,
-            'competing_vendors': json.loads(self.competing_vendors) if self.competing_vendors else [],
+            'competing_vendors': _json_column(self, 'competing_vendors', []),
             'competitive_status': self.competitive_status,
-            'tech_stack': json.loads(self.tech_stack) if self.tech_stack else [],
-            'last_activity_at': self.last_activity_at.isoformat() if self.last_activity_at else None,
+            'tech_stack': _json_column(self, 'tech_stack', []),
+            'last_activity_at': self.last_activity_at,
             'next_action': self.next_action,
-            'next_action_date': self.next_action_date.isoformat() if self.next_action_date else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'next_action_date': self.next_action_date,
+            'created_at': self.created_at
         }
 
 
 class AccountActivity(db.Model):
     """Activity log for tracked accounts."""
     __tablename__ = 'account_activities'
+    __table_args__ = (
+        db.Index('ix_account_activities_account_date', 'account_id', 'activity_date'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     account_id = db.Column(db.Integer, db.ForeignKey('tracked_accounts.id'), nullable=False)
@@ -747,7 +907,7 @@ class AccountActivity(db.Model):
             'competitor_name': self.competitor.name if self.competitor else None,
             'competitive_insight': self.competitive_insight,
             'logged_by': self.logged_by,
-            'activity_date': self.activity_date.isoformat() if self.activity_date else None
+            'activity_date': self.activity_date
         }
 
 
@@ -761,6 +921,9 @@ class FeatureComparison(db.Model):
     Allows detailed feature-by-feature comparison with competitors.
     """
     __tablename__ = 'feature_comparisons'
+    __table_args__ = (
+        db.Index('ix_feature_comparisons_category', 'category', 'feature_name'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     
@@ -777,7 +940,7 @@ class FeatureComparison(db.Model):
     competitor_capabilities = db.Column(db.Text)
     
     # Importance
-    customer_importance = db.Column(db.Integer, default=5)  # 1-10
+    customer_importance = db.Column(db.SmallInteger, default=5)  # 1-10
     differentiation_level = db.Column(db.String(50))  # unique, better, parity, weaker
     
     # Metadata
@@ -794,11 +957,72 @@ class FeatureComparison(db.Model):
             'description': self.description,
             'our_capability': self.our_capability,
             'our_details': self.our_details,
-            'competitor_capabilities': json.loads(self.competitor_capabilities) if self.competitor_capabilities else {},
+            'competitor_capabilities': _json_column(self, 'competitor_capabilities', {}),
             'customer_importance': self.customer_importance,
             'differentiation_level': self.differentiation_level,
-            'last_verified': self.last_verified.isoformat() if self.last_verified else None
+            'last_verified': self.last_verified
         }
+    
+    def get_competitor_capabilities(self):
+        """Get parsed competitor capabilities, keyed by competitor id string."""
+        return _json_column(self, 'competitor_capabilities', {}, copy_result=True)
+
+
+# =============================================================================
+# DENORMALIZED COMPETITOR NAMES
+# =============================================================================
+
+# Models that carry competitor_name so list serialization needs no join
+_COMPETITOR_NAME_MODELS = (Alert, Insight, BattleCard, WinLossRecord)
+
+
+def _competitor_name(connection, target):
+    """
+    Name of the row's competitor, taken from the loaded relationship or the
+    session's identity map; only a competitor not in the session is queried.
+    """
+    state = inspect(target)
+    competitor = None
+    if 'competitor' not in state.unloaded:
+        competitor = target.competitor
+    if (competitor is None or competitor.id != target.competitor_id) and state.session is not None:
+        key = state.session.identity_key(Competitor, target.competitor_id)
+        competitor = state.session.identity_map.get(key)
+    if competitor is not None:
+        return competitor.name
+    return connection.scalar(db.select(Competitor.name).where(Competitor.id == target.competitor_id))
+
+
+def _fill_competitor_name(mapper, connection, target):
+    """Copy the competitor's name onto a new row."""
+    if target.competitor_name is None and target.competitor_id is not None:
+        target.competitor_name = _competitor_name(connection, target)
+
+
+def _refresh_competitor_name(mapper, connection, target):
+    """Re-copy the competitor's name when a row is moved to another competitor."""
+    if inspect(target).attrs.competitor_id.history.has_changes():
+        target.competitor_name = (
+            _competitor_name(connection, target) if target.competitor_id is not None else None
+        )
+
+
+for _model in _COMPETITOR_NAME_MODELS:
+    event.listen(_model, 'before_insert', _fill_competitor_name)
+    event.listen(_model, 'before_update', _refresh_competitor_name)
+
+
+@event.listens_for(Competitor, 'after_update')
+def _propagate_competitor_rename(mapper, connection, target):
+    """Rewrite the denormalized names when a competitor is renamed."""
+    if not inspect(target).attrs.name.history.has_changes():
+        return
+    for model in _COMPETITOR_NAME_MODELS:
+        connection.execute(
+            db.update(model.__table__)
+            .where(model.__table__.c.competitor_id == target.id)
+            .values(competitor_name=target.name)
+        )
 
 
 def init_db():
@@ -4,11 +4,15 @@ Supports PDF and CSV export.
 """
 import os
 import io
+import copy
 import csv
+import itertools
 import json
 import logging
+import threading
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from xml.sax.saxutils import escape
+from typing import List, Dict, Optional, Any, Iterable, Iterator
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -21,30 +25,135 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 
 from .database import Alert, Insight, Competitor, NewsItem
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Characters of CSV buffered before iter_csv hands a chunk to the response
+CSV_CHUNK_SIZE = 64 * 1024
+
+# Built once at import: Table.setStyle only reads the commands, so every
+# export can share these
+SCORES_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a237e')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 11),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f5f5f5')),
+    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#ddd'))
+])
+
+COMPARISON_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0d47a1')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#ddd')),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
+])
+
+ACTIONS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2e7d32')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#ddd')),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f1f8e9')])
+])
+
+SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a237e')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#ddd')),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')])
+])
+
+# Static part of every report header; see ReportExporter._create_header
+_HEADER_SPACER = Spacer(1, 20)
+_HEADER_RULE = HRFlowable(width="100%", thickness=2, color=colors.HexColor('#1a237e'))
+
+# Insight action columns as (priority label, column, timeline) in report order
+_ACTION_BUCKETS = (
+    ('Immediate', 'immediate_actions', '24-48 hours'),
+    ('Short-term', 'short_term_actions', '1-4 weeks'),
+    ('Long-term', 'long_term_actions', 'Quarter+'),
+)
+
+# Feature comparison cells, ticking the winning side
+_WINNER_FMT = {
+    'fluke': lambda fluke, comp: (f"✓ {fluke}", comp),
+    'competitor': lambda fluke, comp: (fluke, f"✓ {comp}"),
+}
+
+
+def _no_winner(fluke, comp):
+    return fluke, comp
+
+
+def _decode_json(value):
+    """Decode a JSON text column, passing already-decoded values through."""
+    return _json_loads(value) if isinstance(value, (str, bytes)) else value
+
+
+def _parse_actions(blob) -> list:
+    """Decode an action list column; empty or malformed JSON yields no actions."""
+    try:
+        return _decode_json(blob) or []
+    except ValueError:
+        return []
+
 
 class ReportExporter:
     """Exports reports in various formats."""
     
+    # Shared, read-only once built; see _build_styles()
+    _styles = None
+    _styles_lock = threading.Lock()
+    
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
+        self.styles = type(self)._styles or type(self)._build_styles()
+    
+    @classmethod
+    def _build_styles(cls):
+        """Build the sample style sheet plus custom paragraph styles once per process."""
+        with cls._styles_lock:
+            if cls._styles is not None:
+                return cls._styles
+            styles = getSampleStyleSheet()
+            cls._add_custom_styles(styles)
+            cls._styles = styles
+            return styles
     
-    def _setup_custom_styles(self):
+    @staticmethod
+    def _add_custom_styles(styles):
         """Set up custom paragraph styles."""
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='ReportTitle',
-            parent=self.styles['Heading1'],
+            parent=styles['Heading1'],
             fontSize=24,
             spaceAfter=30,
             alignment=TA_CENTER,
             textColor=colors.HexColor('#1a237e')
         ))
         
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='SectionHeader',
-            parent=self.styles['Heading2'],
+            parent=styles['Heading2'],
             fontSize=14,
             spaceBefore=20,
             spaceAfter=10,
@@ -54,26 +163,26 @@ class ReportExporter:
             borderPadding=5
         ))
         
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='SubHeader',
-            parent=self.styles['Heading3'],
+            parent=styles['Heading3'],
             fontSize=12,
             spaceBefore=15,
             spaceAfter=8,
             textColor=colors.HexColor('#1565c0')
         ))
         
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='BodyTextJustified',
-            parent=self.styles['BodyText'],
+            parent=styles['BodyText'],
             alignment=TA_JUSTIFY,
             fontSize=10,
             leading=14
         ))
         
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='BulletPoint',
-            parent=self.styles['BodyText'],
+            parent=styles['BodyText'],
             fontSize=10,
             leftIndent=20,
             bulletIndent=10,
@@ -81,25 +190,25 @@ class ReportExporter:
             spaceAfter=3
         ))
         
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='RiskCritical',
-            parent=self.styles['BodyText'],
+            parent=styles['BodyText'],
             textColor=colors.red,
             fontSize=11,
             fontName='Helvetica-Bold'
         ))
         
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='RiskHigh',
-            parent=self.styles['BodyText'],
+            parent=styles['BodyText'],
             textColor=colors.HexColor('#ff5722'),
             fontSize=11,
             fontName='Helvetica-Bold'
         ))
         
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='RiskMedium',
-            parent=self.styles['BodyText'],
+            parent=styles['BodyText'],
             textColor=colors.HexColor('#ff9800'),
             fontSize=11
         ))
@@ -126,9 +235,10 @@ class ReportExporter:
         date_str = datetime.now().strftime('%B %d, %Y at %H:%M')
         elements.append(Paragraph(f"Generated: {date_str}", self.styles['BodyText']))
         
-        elements.append(Spacer(1, 20))
-        elements.append(HRFlowable(width="100%", thickness=2, color=colors.HexColor('#1a237e')))
-        elements.append(Spacer(1, 20))
+        # Platypus sets layout state on flowables, so each document gets its own copies
+        elements.append(copy.copy(_HEADER_SPACER))
+        elements.append(copy.copy(_HEADER_RULE))
+        elements.append(copy.copy(_HEADER_SPACER))
         
         return elements
     
@@ -169,16 +279,7 @@ class ReportExporter:
         ]
         
         scores_table = Table(scores_data, colWidths=[2*inch, 1.5*inch, 1.5*inch])
-        scores_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a237e')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f5f5f5')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#ddd'))
-        ]))
+        scores_table.setStyle(SCORES_TABLE_STYLE)
         elements.append(scores_table)
         elements.append(Spacer(1, 20))
         
@@ -194,34 +295,17 @@ class ReportExporter:
             # Add feature comparison
             if insight.feature_comparison:
                 try:
-                    features = json.loads(insight.feature_comparison) if isinstance(insight.feature_comparison, str) else insight.feature_comparison
+                    features = _decode_json(insight.feature_comparison)
                     for feature, data in features.items():
-                        winner_mark = lambda w, t: f"✓ {t}" if w == 'fluke' else (f"✓ {t}" if w == 'competitor' else t)
-                        fluke_val = data.get('fluke', 'N/A')
-                        comp_val = data.get('competitor', 'N/A')
-                        winner = data.get('winner', 'tie')
-                        
-                        if winner == 'fluke':
-                            fluke_val = f"✓ {fluke_val}"
-                        elif winner == 'competitor':
-                            comp_val = f"✓ {comp_val}"
-                        
+                        fluke_val, comp_val = _WINNER_FMT.get(data.get('winner'), _no_winner)(
+                            data.get('fluke', 'N/A'), data.get('competitor', 'N/A')
+                        )
                         comparison_data.append([feature, fluke_val, comp_val])
                 except:
                     pass
             
             comp_table = Table(comparison_data, colWidths=[2*inch, 2.25*inch, 2.25*inch])
-            comp_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0d47a1')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#ddd')),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
-            ]))
+            comp_table.setStyle(COMPARISON_TABLE_STYLE)
             elements.append(comp_table)
             elements.append(Spacer(1, 10))
             
@@ -236,75 +320,43 @@ class ReportExporter:
         elements.append(PageBreak())
         elements.append(Paragraph("Team Recommendations", self.styles['SectionHeader']))
         
-        team_sections = [
-            ('Sales', insight.sales_insights),
-            ('Marketing', insight.marketing_insights),
-            ('Product', insight.product_insights),
-            ('Engineering', insight.engineering_insights),
-            ('Executive', insight.executive_insights)
-        ]
+        team_sections = ['Sales', 'Marketing', 'Product', 'Engineering', 'Executive']
         
-        for team_name, team_data in team_sections:
-            if team_data:
-                try:
-                    data = json.loads(team_data) if isinstance(team_data, str) else team_data
-                    if data and data.get('summary'):
-                        elements.append(Paragraph(f"{team_name} Team", self.styles['SubHeader']))
-                        elements.append(Paragraph(data['summary'], self.styles['BodyTextJustified']))
-                        
-                        # Add key points
-                        for key in ['talking_points', 'messaging_recommendations', 'feature_gaps', 
-                                   'r_and_d_priorities', 'investment_recommendations']:
-                            if data.get(key):
-                                elements.append(Paragraph(f"<b>{key.replace('_', ' ').title()}:</b>", self.styles['BodyText']))
-                                for point in data[key]:
-                                    elements.append(Paragraph(f"• {point}", self.styles['BulletPoint']))
-                        
-                        elements.append(Spacer(1, 10))
-                except:
-                    pass
+        for team_name in team_sections:
+            try:
+                # Reuses the decode cached on the instance by to_dict()
+                data = insight.get_team_insights(team_name)
+                if data and data.get('summary'):
+                    elements.append(Paragraph(f"{team_name} Team", self.styles['SubHeader']))
+                    elements.append(Paragraph(data['summary'], self.styles['BodyTextJustified']))
+                    
+                    # Add key points
+                    for key in ['talking_points', 'messaging_recommendations', 'feature_gaps', 
+                               'r_and_d_priorities', 'investment_recommendations']:
+                        if data.get(key):
+                            elements.append(Paragraph(f"<b>{key.replace('_', ' ').title()}:</b>", self.styles['BodyText']))
+                            # One paragraph per list rather than per bullet keeps the flowable count down
+                            bullets = '<br/>'.join(f"• {escape(str(point))}" for point in data[key])
+                            elements.append(Paragraph(bullets, self.styles['BulletPoint']))
+                    
+                    elements.append(Spacer(1, 10))
+            except:
+                pass
         
         # Action Items
         elements.append(Paragraph("Action Items", self.styles['SectionHeader']))
         
         actions_data = [['Priority', 'Action', 'Timeline']]
         
-        if insight.immediate_actions:
-            try:
-                actions = json.loads(insight.immediate_actions) if isinstance(insight.immediate_actions, str) else insight.immediate_actions
-                for action in actions:
-                    actions_data.append(['Immediate', action if isinstance(action, str) else action.get('action', str(action)), '24-48 hours'])
-            except:
-                pass
-        
-        if insight.short_term_actions:
-            try:
-                actions = json.loads(insight.short_term_actions) if isinstance(insight.short_term_actions, str) else insight.short_term_actions
-                for action in actions:
-                    actions_data.append(['Short-term', action if isinstance(action, str) else action.get('action', str(action)), '1-4 weeks'])
-            except:
-                pass
-        
-        if insight.long_term_actions:
-            try:
-                actions = json.loads(insight.long_term_actions) if isinstance(insight.long_term_actions, str) else insight.long_term_actions
-                for action in actions:
-                    actions_data.append(['Long-term', action if isinstance(action, str) else action.get('action', str(action)), 'Quarter+'])
-            except:
-                pass
+        actions_data.extend(
+            [priority, action.get('action', str(action)) if isinstance(action, dict) else str(action), timeline]
+            for priority, column, timeline in _ACTION_BUCKETS
+            for action in _parse_actions(getattr(insight, column))
+        )
         
         if len(actions_data) > 1:
             actions_table = Table(actions_data, colWidths=[1.25*inch, 4*inch, 1.25*inch])
-            actions_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2e7d32')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#ddd')),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f1f8e9')])
-            ]))
+            actions_table.setStyle(ACTIONS_TABLE_STYLE)
             elements.append(actions_table)
         
         # Build PDF
@@ -361,7 +413,7 @@ class ReportExporter:
         if alert.recommended_actions:
             elements.append(Paragraph("Recommended Actions", self.styles['SubHeader']))
             try:
-                actions = json.loads(alert.recommended_actions)
+                actions = alert.get_recommended_actions()
                 for action in actions:
                     action_text = action.get('action', str(action)) if isinstance(action, dict) else str(action)
                     owner = action.get('owner', '') if isinstance(action, dict) else ''
@@ -378,7 +430,13 @@ class ReportExporter:
         return buffer
     
     def export_alerts_summary_pdf(self, alerts: List[Alert], title: str = "Alerts Summary Report") -> io.BytesIO:
-        """Export multiple alerts as a summary PDF."""
+        """
+        Export multiple alerts as a summary PDF.
+        
+        Args:
+            alerts: Alert instances, or rows with title, risk_level, signal_type and detected_at
+            title: Report title
+        """
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter)
         
@@ -400,32 +458,46 @@ class ReportExporter:
                 ])
             
             table = Table(summary_data, colWidths=[0.4*inch, 3*inch, 0.8*inch, 1.2*inch, 0.8*inch])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a237e')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#ddd')),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')])
-            ]))
+            table.setStyle(SUMMARY_TABLE_STYLE)
             elements.append(table)
         
         doc.build(elements)
         buffer.seek(0)
         return buffer
     
-    def export_csv(self, data: List[Dict], filename_prefix: str = "export") -> io.StringIO:
-        """Export data as CSV."""
-        buffer = io.StringIO()
-        
-        if not data:
-            return buffer
+    def iter_csv(self, rows: Iterable[Dict], fieldnames: Optional[List[str]] = None) -> Iterator[str]:
+        """
+        Yield CSV text in chunks as rows are consumed.
+        
+        Args:
+            rows: Any iterable of dicts, e.g. a generator over a query
+            fieldnames: Column order; defaults to the first row's keys
+        """
+        rows = iter(rows)
+        if fieldnames is None:
+            first = next(rows, None)
+            if first is None:
+                return
+            fieldnames = list(first.keys())
+            rows = itertools.chain([first], rows)
         
-        writer = csv.DictWriter(buffer, fieldnames=data[0].keys())
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames)
         writer.writeheader()
-        writer.writerows(data)
         
+        for row in rows:
+            writer.writerow(row)
+            if buffer.tell() >= CSV_CHUNK_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        
+        if buffer.tell():
+            yield buffer.getvalue()
+    
+    def export_csv(self, data: List[Dict], filename_prefix: str = "export") -> io.StringIO:
+        """Export data as CSV."""
+        buffer = io.StringIO()
+        buffer.writelines(self.iter_csv(data))
         buffer.seek(0)
         return buffer
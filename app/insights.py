@@ -13,6 +13,15 @@ from .database import (
     db, Insight, Alert, NewsItem, Competitor
 )
 
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        # Insight columns are TEXT, so hand back str rather than bytes
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    _json_dumps = json.dumps
+
 logger = logging.getLogger(__name__)
 
 
@@ -269,18 +278,18 @@ If the content doesn't clearly indicate a product launch or competitive threat,
                 competitor_product=result.get('competitor_product'),
                 fluke_product=result.get('fluke_product'),
                 comparison_summary=result.get('comparison_summary'),
-                competitor_advantages=json.dumps(result.get('competitor_advantages', [])),
-                fluke_advantages=json.dumps(result.get('fluke_advantages', [])),
+                competitor_advantages=_json_dumps(result.get('competitor_advantages', [])),
+                fluke_advantages=_json_dumps(result.get('fluke_advantages', [])),
                 pricing_comparison=result.get('pricing_comparison'),
-                feature_comparison=json.dumps(result.get('feature_comparison', {})),
-                sales_insights=json.dumps(result.get('sales_insights', {})),
-                marketing_insights=json.dumps(result.get('marketing_insights', {})),
-                product_insights=json.dumps(result.get('product_insights', {})),
-                engineering_insights=json.dumps(result.get('engineering_insights', {})),
-                executive_insights=json.dumps(result.get('executive_insights', {})),
-                immediate_actions=json.dumps(result.get('immediate_actions', [])),
-                short_term_actions=json.dumps(result.get('short_term_actions', [])),
-                long_term_actions=json.dumps(result.get('long_term_actions', [])),
+                feature_comparison=_json_dumps(result.get('feature_comparison', {})),
+                sales_insights=_json_dumps(result.get('sales_insights', {})),
+                marketing_insights=_json_dumps(result.get('marketing_insights', {})),
+                product_insights=_json_dumps(result.get('product_insights', {})),
+                engineering_insights=_json_dumps(result.get('engineering_insights', {})),
+                executive_insights=_json_dumps(result.get('executive_insights', {})),
+                immediate_actions=_json_dumps(result.get('immediate_actions', [])),
+                short_term_actions=_json_dumps(result.get('short_term_actions', [])),
+                long_term_actions=_json_dumps(result.get('long_term_actions', [])),
                 impact_score=result.get('impact_score', 50),
                 urgency_score=result.get('urgency_score', 50),
                 confidence_score=result.get('confidence_score', 50)
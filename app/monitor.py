@@ -8,9 +8,11 @@ import html2text
 import xxhash
 from datetime import datetime, timedelta
 from difflib import unified_diff
+from collections import Counter
 import logging
 import time
 from typing import Optional, Tuple, List, Dict
+from sqlalchemy.orm import undefer
 from .database import db, MonitoredURL, PageSnapshot, Competitor
 
 logger = logging.getLogger(__name__)
@@ -105,8 +107,37 @@ class PageMonitor:
         
         return '\n'.join(diff)
     
+    def compute_line_changes(self, old_content: str, new_content: str) -> Tuple[List[str], List[str]]:
+        """
+        Compute the lines added and removed between two versions.
+        
+        Compares the versions as multisets of lines, which is linear in the
+        page size (difflib is quadratic in the worst case). Lines that only
+        moved are not reported.
+        
+        Returns:
+            Tuple of (added_lines, removed_lines), each in document order
+        """
+        old_lines = old_content.split('\n')
+        new_lines = new_content.split('\n')
+        old_counts = Counter(old_lines)
+        new_counts = Counter(new_lines)
+        
+        def surplus_lines(lines, surplus):
+            result = []
+            for line in lines:
+                if surplus[line] > 0:
+                    surplus[line] -= 1
+                    result.append(line)
+            return result
+        
+        return (
+            surplus_lines(new_lines, new_counts - old_counts),
+            surplus_lines(old_lines, old_counts - new_counts)
+        )
+    
     def summarize_changes(self, diff: str) -> str:
-        """Create a human-readable summary of changes."""
+        """Create a human-readable summary of changes from a unified diff."""
         if not diff:
             return "No changes detected"
         
@@ -115,13 +146,17 @@ class PageMonitor:
         
         for line in diff.split('\n'):
             if line.startswith('+') and not line.startswith('+++'):
-                added_lines.append(line[1:].strip())
+                added_lines.append(line[1:])
             elif line.startswith('-') and not line.startswith('---'):
-                removed_lines.append(line[1:].strip())
+                removed_lines.append(line[1:])
         
+        return self.summarize_line_changes(added_lines, removed_lines)
+    
+    def summarize_line_changes(self, added_lines: List[str], removed_lines: List[str]) -> str:
+        """Create a human-readable summary of added and removed lines."""
         # Filter out empty lines
-        added_lines = [l for l in added_lines if l]
-        removed_lines = [l for l in removed_lines if l]
+        added_lines = [l.strip() for l in added_lines if l.strip()]
+        removed_lines = [l.strip() for l in removed_lines if l.strip()]
         
         summary_parts = []
         
@@ -139,10 +174,14 @@ class PageMonitor:
         
         return '\n\n'.join(summary_parts) if summary_parts else "Minor formatting changes only"
     
-    def check_url(self, monitored_url: MonitoredURL) -> Optional[PageSnapshot]:
+    def check_url(self, monitored_url: MonitoredURL, commit: bool = True) -> Optional[PageSnapshot]:
         """
         Check a single URL for changes.
         
+        Args:
+            monitored_url: The URL to check
+            commit: If False, only flush and leave the commit to the caller
+        
         Returns:
             PageSnapshot if changes detected, None otherwise
         """
@@ -156,7 +195,8 @@ class PageMonitor:
             monitored_url.last_error = error
             monitored_url.consecutive_errors += 1
             monitored_url.last_checked_at = datetime.utcnow()
-            db.session.commit()
+            if commit:
+                db.session.commit()
             return None
         
         # Reset error count on success
@@ -178,8 +218,8 @@ class PageMonitor:
             if content_hash != monitored_url.last_content_hash:
                 has_changes = True
                 if monitored_url.last_content:
-                    diff = self.compute_diff(monitored_url.last_content, extracted_text)
-                    diff_summary = self.summarize_changes(diff)
+                    added, removed = self.compute_line_changes(monitored_url.last_content, extracted_text)
+                    diff_summary = self.summarize_line_changes(added, removed)
                 logger.info(f"Changes detected on {monitored_url.url}")
         else:
             # First time checking this URL
@@ -200,16 +240,21 @@ class PageMonitor:
         monitored_url.last_content = extracted_text[:50000]
         
         db.session.add(snapshot)
-        db.session.commit()
+        if commit:
+            db.session.commit()
+        else:
+            db.session.flush()
         
         return snapshot if has_changes else None
     
-    def check_all_urls(self, force: bool = False) -> List[PageSnapshot]:
+    def check_all_urls(self, force: bool = False, commit: bool = True) -> List[PageSnapshot]:
         """
         Check all active monitored URLs for changes.
         
         Args:
             force: If True, check all URLs regardless of last check time
+            commit: If False, leave committing to the caller's transaction;
+                otherwise each URL is committed before the next fetch
             
         Returns:
             List of PageSnapshots with detected changes
@@ -217,7 +262,9 @@ class PageMonitor:
         changed_snapshots = []
         
         # Get all active URLs
-        urls = MonitoredURL.query.filter_by(is_active=True).all()
+        urls = MonitoredURL.query.options(
+            undefer(MonitoredURL.last_content)
+        ).filter_by(is_active=True).all()
         
         for monitored_url in urls:
             # Check if we should skip based on interval
@@ -230,7 +277,11 @@ class PageMonitor:
                     continue
             
             try:
-                snapshot = self.check_url(monitored_url)
+                # A savepoint per URL, so one failure doesn't poison the session
+                with db.session.begin_nested():
+                    snapshot = self.check_url(monitored_url, commit=False)
+                if commit:
+                    db.session.commit()
                 if snapshot and snapshot.has_changes:
                     changed_snapshots.append(snapshot)
                 
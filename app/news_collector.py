@@ -190,6 +190,20 @@ class NewsCollector:
         feed_url = f'https://news.google.com/rss/search?q={encoded_query}&hl=en-US&gl=US&ceid=US:en'
         return self.fetch_rss_feed(feed_url)
     
+    @staticmethod
+    def _title_words(title: str) -> set:
+        """Normalized word set of a title, for similarity checks."""
+        return set(re.sub(r'[^\w\s]', '', title.lower()).split())
+    
+    @staticmethod
+    def _similar_titles(title_words: set, existing_words: set) -> bool:
+        """Simple similarity check - if 80% of words match."""
+        if title_words and existing_words:
+            overlap = len(title_words & existing_words)
+            similarity = overlap / max(len(title_words), len(existing_words))
+            return similarity > 0.8
+        return False
+    
     def is_duplicate(self, title: str, url: str) -> bool:
         """Check if a news item already exists."""
         # Check by URL first
@@ -198,21 +212,14 @@ class NewsCollector:
             return True
         
         # Check by similar title (basic deduplication)
-        normalized_title = re.sub(r'[^\w\s]', '', title.lower())
+        title_words = self._title_words(title)
         recent_items = NewsItem.query.filter(
             NewsItem.collected_at >= datetime.utcnow() - timedelta(days=7)
         ).all()
         
         for item in recent_items:
-            existing_normalized = re.sub(r'[^\w\s]', '', item.title.lower())
-            # Simple similarity check - if 80% of words match
-            title_words = set(normalized_title.split())
-            existing_words = set(existing_normalized.split())
-            if title_words and existing_words:
-                overlap = len(title_words & existing_words)
-                similarity = overlap / max(len(title_words), len(existing_words))
-                if similarity > 0.8:
-                    return True
+            if self._similar_titles(title_words, self._title_words(item.title)):
+                return True
         
         return False
     
@@ -227,9 +234,40 @@ class NewsCollector:
         
         return False
     
-    def collect_competitor_news(self, competitor: Competitor, days_back: int = 7) -> List[NewsItem]:
-        """Collect news for a specific competitor."""
-        collected_items = []
+    def collect_competitor_news(self, competitor: Competitor, days_back: int = 7,
+                                commit: bool = True) -> List[NewsItem]:
+        """
+        Collect news for a specific competitor.
+        
+        Pass commit=False to leave the commit to the caller's transaction.
+        New items are inserted together in one statement at the end.
+        """
+        rows = []
+        # Rows aren't in the database until the bulk insert, so dedupe within the batch too
+        batch_urls = set()
+        batch_titles = []
+        
+        def is_new(article):
+            if not article['title'] or not article['url']:
+                return False
+            
+            # Check for duplicates
+            title_words = self._title_words(article['title'])
+            if article['url'] in batch_urls or any(
+                self._similar_titles(title_words, words) for words in batch_titles
+            ):
+                return False
+            if self.is_duplicate(article['title'], article['url']):
+                return False
+            
+            # Filter out stock/finance news
+            if self.is_finance_news(article['title'], article.get('description', '')):
+                return False
+            
+            batch_urls.add(article['url'])
+            batch_titles.append(title_words)
+            return True
+        
         search_terms = self.get_competitor_search_terms(competitor)
         from_date = datetime.utcnow() - timedelta(days=days_back)
         
@@ -243,32 +281,8 @@ class NewsCollector:
             logger.info(f"Found {len(articles)} articles from {feed_name}")
             
             for article in articles:
-                if not article['title'] or not article['url']:
-                    continue
-                
-                # Check for duplicates
-                if self.is_duplicate(article['title'], article['url']):
-                    continue
-                
-                # Filter out stock/finance news
-                if self.is_finance_news(article['title'], article.get('description', '')):
-                    continue
-                
-                # Create news item
-                news_item = NewsItem(
-                    competitor_id=competitor.id,
-                    title=article['title'][:500],
-                    description=article.get('description', '')[:2000] if article.get('description') else None,
-                    content=article.get('content', '')[:10000] if article.get('content') else None,
-                    url=article['url'][:1000],
-                    source=article.get('source', feed_name)[:255],
-                    author=article.get('author', '')[:255] if article.get('author') else None,
-                    published_at=article.get('published_at'),
-                    is_processed=False
-                )
-                
-                db.session.add(news_item)
-                collected_items.append(news_item)
+                if is_new(article):
+                    rows.append(self._news_row(competitor, article, article.get('source', feed_name)))
         
         # Then search for competitor by name using Google News RSS
         for term in search_terms:
@@ -277,46 +291,47 @@ class NewsCollector:
             logger.info(f"Found {len(articles)} articles from Google News for '{term}'")
             
             for article in articles:
-                if not article['title'] or not article['url']:
-                    continue
-                
-                # Check for duplicates
-                if self.is_duplicate(article['title'], article['url']):
-                    continue
-                
-                # Filter out stock/finance news
-                if self.is_finance_news(article['title'], article.get('description', '')):
-                    continue
-                
-                # Create news item
-                news_item = NewsItem(
-                    competitor_id=competitor.id,
-                    title=article['title'][:500],
-                    description=article.get('description', '')[:2000] if article.get('description') else None,
-                    content=article.get('content', '')[:10000] if article.get('content') else None,
-                    url=article['url'][:1000],
-                    source=article.get('source', '')[:255],
-                    author=article.get('author', '')[:255] if article.get('author') else None,
-                    published_at=article.get('published_at'),
-                    is_processed=False
-                )
-                
-                db.session.add(news_item)
-                collected_items.append(news_item)
+                if is_new(article):
+                    rows.append(self._news_row(competitor, article, article.get('source', '')))
         
-        db.session.commit()
+        collected_items = NewsItem.bulk_insert(rows, returning=True)
+        if commit:
+            db.session.commit()
         logger.info(f"Collected {len(collected_items)} new articles for {competitor.name}")
         return collected_items
     
-    def collect_all_news(self, days_back: int = 7) -> Dict[str, List[NewsItem]]:
-        """Collect news for all active competitors."""
+    def _news_row(self, competitor: Competitor, article: Dict, source: str) -> Dict:
+        """Column values for a new NewsItem from a fetched article."""
+        return {
+            'competitor_id': competitor.id,
+            'title': article['title'][:500],
+            'description': article.get('description', '')[:2000] if article.get('description') else None,
+            'content': article.get('content', '')[:10000] if article.get('content') else None,
+            'url': article['url'][:1000],
+            'source': source[:255],
+            'author': article.get('author', '')[:255] if article.get('author') else None,
+            'published_at': article.get('published_at'),
+            'is_processed': False
+        }
+    
+    def collect_all_news(self, days_back: int = 7, commit: bool = True) -> Dict[str, List[NewsItem]]:
+        """
+        Collect news for all active competitors.
+        
+        Each competitor's items are committed as soon as they are inserted;
+        with commit=False they stay in the caller's transaction instead.
+        """
         results = {}
         
         competitors = Competitor.query.filter_by(is_active=True).all()
         
         for competitor in competitors:
             try:
-                items = self.collect_competitor_news(competitor, days_back)
+                # A savepoint per competitor, so one failure doesn't poison the session
+                with db.session.begin_nested():
+                    items = self.collect_competitor_news(competitor, days_back, commit=False)
+                if commit:
+                    db.session.commit()
                 results[competitor.name] = items
             except Exception as e:
                 logger.error(f"Error collecting news for {competitor.name}: {e}")
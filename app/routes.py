@@ -1,13 +1,18 @@
 """
 Flask Routes for Web Dashboard and API
 """
-from flask import Blueprint, render_template, jsonify, request, redirect, url_for, send_file, current_app
+from flask import (
+    Blueprint, render_template, jsonify, request, redirect, url_for, send_file, current_app,
+    Response, make_response, stream_with_context
+)
 from datetime import datetime, timedelta
 import json
-import io
 import os
+import time
 import threading
 import logging
+from functools import wraps
+from sqlalchemy.orm import joinedload, selectinload, undefer
 from .database import (
     db, Alert, Competitor, MonitoredURL, PageSnapshot, NewsItem, Insight,
     AlertStatus, RiskLevel, SignalType,
@@ -19,6 +24,70 @@ from .database import (
 main_bp = Blueprint('main', __name__)
 api_bp = Blueprint('api', __name__)
 
+# Polled list responses, reused while the listed tables are unchanged
+LIST_CACHE_TTL = int(os.getenv('LIST_CACHE_TTL', 30))
+LIST_CACHE_MAX_ENTRIES = 256
+_list_cache = {}
+_list_cache_lock = threading.Lock()
+
+
+def _list_cache_version():
+    """Values that change on any alert, competitor or URL write, whichever process made it."""
+    return db.session.execute(db.select(
+        db.select(db.func.max(Alert.updated_at)).scalar_subquery(),
+        db.select(db.func.count(Alert.id)).scalar_subquery(),
+        db.select(db.func.max(Competitor.updated_at)).scalar_subquery(),
+        db.select(db.func.count(Competitor.id)).scalar_subquery(),
+        db.select(db.func.max(MonitoredURL.updated_at)).scalar_subquery(),
+        db.select(db.func.count(MonitoredURL.id)).scalar_subquery()
+    )).one()
+
+
+def cached_list(view):
+    """
+    Cache a JSON list endpoint per query string for LIST_CACHE_TTL seconds.
+    
+    Entries are keyed on _list_cache_version, so writes from other workers
+    bypass the cache too; API writes in this process also clear it. Only
+    200 responses are cached. Responses carry an ETag so polling clients
+    get 304s for unchanged data.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = (request.path, request.query_string, tuple(_list_cache_version()))
+        now = time.monotonic()
+        
+        with _list_cache_lock:
+            entry = _list_cache.get(key)
+        if entry and entry[0] > now:
+            response = current_app.response_class(entry[1], mimetype='application/json')
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            with _list_cache_lock:
+                if len(_list_cache) >= LIST_CACHE_MAX_ENTRIES:
+                    for stale_key in [k for k, (expires, _) in _list_cache.items() if expires <= now]:
+                        del _list_cache[stale_key]
+                    if len(_list_cache) >= LIST_CACHE_MAX_ENTRIES:
+                        _list_cache.clear()
+                _list_cache[key] = (now + LIST_CACHE_TTL, response.get_data())
+        
+        response.headers['Cache-Control'] = 'private, no-cache'
+        response.headers['Vary'] = 'Authorization'
+        response.add_etag()
+        return response.make_conditional(request)
+    return wrapper
+
+
+@api_bp.after_request
+def _clear_list_cache_on_write(response):
+    """Drop cached list responses after any API write."""
+    if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+        with _list_cache_lock:
+            _list_cache.clear()
+    return response
+
 
 # =============================================================================
 # WEB ROUTES
@@ -152,32 +221,35 @@ def get_stats():
         Alert.status.in_([AlertStatus.NEW.value, AlertStatus.ACKNOWLEDGED.value, AlertStatus.IN_PROGRESS.value])
     ).count()
     
-    # Risk distribution
-    risk_distribution = {}
-    for level in RiskLevel:
-        count = Alert.query.filter_by(risk_level=level.value).count()
-        risk_distribution[level.value] = count
+    # Risk distribution (one grouped scan instead of a COUNT per level)
+    risk_counts = dict(db.session.execute(
+        db.select(Alert.risk_level, db.func.count(Alert.id)).group_by(Alert.risk_level)
+    ).all())
+    risk_distribution = {level.value: risk_counts.get(level.value, 0) for level in RiskLevel}
     
     # Signal type distribution
-    signal_distribution = {}
-    for signal in SignalType:
-        count = Alert.query.filter_by(signal_type=signal.value).count()
-        if count > 0:
-            signal_distribution[signal.value] = count
+    signal_counts = dict(db.session.execute(
+        db.select(Alert.signal_type, db.func.count(Alert.id)).group_by(Alert.signal_type)
+    ).all())
+    signal_distribution = {
+        signal.value: signal_counts[signal.value]
+        for signal in SignalType if signal_counts.get(signal.value)
+    }
     
     # Competitor stats
-    competitors = Competitor.query.filter_by(is_active=True).all()
+    competitors = Competitor.query.options(selectinload(Competitor.monitored_urls)).filter_by(is_active=True).all()
+    new_alert_counts = dict(db.session.execute(
+        db.select(Alert.competitor_id, db.func.count(Alert.id))
+        .where(Alert.status == AlertStatus.NEW.value)
+        .group_by(Alert.competitor_id)
+    ).all())
     competitor_stats = []
     for comp in competitors:
-        alerts_count = Alert.query.filter_by(
-            competitor_id=comp.id,
-            status=AlertStatus.NEW.value
-        ).count()
         competitor_stats.append({
             'id': comp.id,
             'name': comp.name,
-            'new_alerts': alerts_count,
-            'urls_monitored': comp.monitored_urls.filter_by(is_active=True).count()
+            'new_alerts': new_alert_counts.get(comp.id, 0),
+            'urls_monitored': sum(1 for u in comp.monitored_urls if u.is_active)
         })
     
     # Recent activity
@@ -205,6 +277,7 @@ def get_stats():
 # =============================================================================
 
 @api_bp.route('/alerts')
+@cached_list
 def list_alerts():
     """List all alerts with filtering."""
     # Query parameters
@@ -319,10 +392,14 @@ def resolve_alert(alert_id):
 # =============================================================================
 
 @api_bp.route('/competitors')
+@cached_list
 def list_competitors():
     """List all competitors."""
-    competitors = Competitor.query.all()
-    return jsonify([c.to_dict() for c in competitors])
+    competitors = Competitor.list_with_counts()
+    return jsonify([
+        c.to_dict(url_count=url_count, alert_count=alert_count)
+        for c, url_count, alert_count in competitors
+    ])
 
 
 @api_bp.route('/competitors', methods=['POST'])
@@ -349,7 +426,7 @@ def get_competitor(competitor_id):
     competitor = Competitor.query.get_or_404(competitor_id)
     
     result = competitor.to_dict()
-    result['monitored_urls'] = [u.to_dict() for u in competitor.monitored_urls.all()]
+    result['monitored_urls'] = [u.to_dict() for u in competitor.monitored_urls]
     result['recent_alerts'] = [
         a.to_dict() for a in competitor.alerts.order_by(Alert.detected_at.desc()).limit(10).all()
     ]
@@ -466,7 +543,9 @@ def list_news():
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
     
-    query = NewsItem.query.filter_by(is_relevant=True)  # Only show relevant news
+    query = NewsItem.query.options(
+        joinedload(NewsItem.competitor).load_only(Competitor.name)
+    ).filter_by(is_relevant=True)  # Only show relevant news
     
     # Search filter - search in title, summary, and content
     if search:
@@ -679,7 +758,7 @@ def purge_finance_alerts():
         keywords = [k.lower() for k in NewsCollector.FINANCE_KEYWORDS]
         deleted = 0
         
-        alerts = Alert.query.filter_by(source_type='news').all()
+        alerts = Alert.query.options(undefer(Alert.raw_content)).filter_by(source_type='news').all()
         for alert in alerts:
             text = ' '.join(filter(None, [
                 alert.title or '',
@@ -744,7 +823,7 @@ def report_summary():
     # Group by competitor
     by_competitor = {}
     for alert in alerts:
-        comp_name = alert.competitor.name if alert.competitor else 'Unknown'
+        comp_name = alert.competitor_name or (alert.competitor.name if alert.competitor else 'Unknown')
         if comp_name not in by_competitor:
             by_competitor[comp_name] = []
         by_competitor[comp_name].append(alert.to_dict())
@@ -932,6 +1011,22 @@ def insights_summary():
 # API ROUTES - Export (PDF/CSV)
 # =============================================================================
 
+# Rows fetched per round trip when streaming exports
+EXPORT_BATCH_SIZE = 500
+
+
+def _csv_download(rows, filename, fieldnames=None):
+    """Stream CSV rows to the client as a file download."""
+    from .exporter import ReportExporter
+    
+    exporter = ReportExporter()
+    return Response(
+        stream_with_context(exporter.iter_csv(rows, fieldnames)),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
+
 @api_bp.route('/export/insight/<int:insight_id>/pdf')
 def export_insight_pdf(insight_id):
     """Export an insight as PDF."""
@@ -980,19 +1075,20 @@ def export_alerts_summary_pdf():
     risk_level = request.args.get('risk_level')
     competitor_id = request.args.get('competitor_id', type=int)
     
-    query = Alert.query
+    # The summary table only shows these columns, so skip building Alert instances
+    query = db.select(Alert.title, Alert.risk_level, Alert.signal_type, Alert.detected_at)
     
     if days:
         since = datetime.utcnow() - timedelta(days=days)
-        query = query.filter(Alert.detected_at >= since)
+        query = query.where(Alert.detected_at >= since)
     
     if risk_level:
-        query = query.filter_by(risk_level=risk_level)
+        query = query.where(Alert.risk_level == risk_level)
     
     if competitor_id:
-        query = query.filter_by(competitor_id=competitor_id)
+        query = query.where(Alert.competitor_id == competitor_id)
     
-    alerts = query.order_by(Alert.detected_at.desc()).all()
+    alerts = db.session.execute(query.order_by(Alert.detected_at.desc())).all()
     
     exporter = ReportExporter()
     pdf_buffer = exporter.export_alerts_summary_pdf(alerts, f"Alerts Report - Last {days} Days")
@@ -1009,111 +1105,96 @@ def export_alerts_summary_pdf():
 @api_bp.route('/export/alerts/csv')
 def export_alerts_csv():
     """Export alerts as CSV."""
-    from .exporter import ReportExporter
-    
     days = request.args.get('days', 30, type=int)
     since = datetime.utcnow() - timedelta(days=days)
     
-    alerts = Alert.query.filter(Alert.detected_at >= since).order_by(Alert.detected_at.desc()).all()
-    
-    data = []
-    for alert in alerts:
-        data.append({
-            'id': alert.id,
-            'title': alert.title,
-            'competitor': alert.competitor.name if alert.competitor else 'Unknown',
-            'risk_level': alert.risk_level,
-            'signal_type': alert.signal_type,
-            'risk_score': alert.risk_score,
-            'summary': alert.summary,
-            'source_url': alert.source_url,
-            'status': alert.status,
-            'detected_at': alert.detected_at.isoformat() if alert.detected_at else ''
-        })
+    # Plain column rows streamed in batches; no ORM instances per alert
+    alerts = db.session.execute(
+        db.select(
+            Alert.id, Alert.title,
+            # Alerts from before competitor_name was stored fall back to the join
+            db.func.coalesce(Alert.competitor_name, Competitor.name).label('competitor_name'),
+            Alert.risk_level, Alert.signal_type, Alert.risk_score, Alert.summary,
+            Alert.source_url, Alert.status, Alert.detected_at
+        ).outerjoin(Competitor, Alert.competitor_id == Competitor.id)
+        .where(Alert.detected_at >= since)
+        .order_by(Alert.detected_at.desc())
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
     
-    exporter = ReportExporter()
-    csv_buffer = exporter.export_csv(data)
+    rows = ({
+        'id': alert.id,
+        'title': alert.title,
+        'competitor': alert.competitor_name or 'Unknown',
+        'risk_level': alert.risk_level,
+        'signal_type': alert.signal_type,
+        'risk_score': alert.risk_score,
+        'summary': alert.summary,
+        'source_url': alert.source_url,
+        'status': alert.status,
+        'detected_at': alert.detected_at.isoformat() if alert.detected_at else ''
+    } for alert in alerts)
     
     filename = f"alerts_export_{datetime.now().strftime('%Y%m%d')}.csv"
-    return send_file(
-        io.BytesIO(csv_buffer.getvalue().encode('utf-8')),
-        mimetype='text/csv',
-        as_attachment=True,
-        download_name=filename
-    )
+    return _csv_download(rows, filename)
 
 
 @api_bp.route('/export/news/csv')
 def export_news_csv():
     """Export news items as CSV."""
-    from .exporter import ReportExporter
-    
     days = request.args.get('days', 30, type=int)
     since = datetime.utcnow() - timedelta(days=days)
     
-    news_items = NewsItem.query.filter(NewsItem.collected_at >= since).order_by(NewsItem.collected_at.desc()).all()
-    
-    data = []
-    for item in news_items:
-        data.append({
-            'id': item.id,
-            'title': item.title,
-            'source': item.source,
-            'url': item.url,
-            'published_at': item.published_at.isoformat() if item.published_at else '',
-            'collected_at': item.collected_at.isoformat() if item.collected_at else '',
-            'is_processed': item.is_processed,
-            'is_relevant': item.is_relevant
-        })
+    news_items = db.session.execute(
+        db.select(
+            NewsItem.id, NewsItem.title, NewsItem.source, NewsItem.url, NewsItem.published_at,
+            NewsItem.collected_at, NewsItem.is_processed, NewsItem.is_relevant
+        ).where(NewsItem.collected_at >= since)
+        .order_by(NewsItem.collected_at.desc())
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
     
-    exporter = ReportExporter()
-    csv_buffer = exporter.export_csv(data)
+    rows = ({
+        'id': item.id,
+        'title': item.title,
+        'source': item.source,
+        'url': item.url,
+        'published_at': item.published_at.isoformat() if item.published_at else '',
+        'collected_at': item.collected_at.isoformat() if item.collected_at else '',
+        'is_processed': item.is_processed,
+        'is_relevant': item.is_relevant
+    } for item in news_items)
     
     filename = f"news_export_{datetime.now().strftime('%Y%m%d')}.csv"
-    return send_file(
-        io.BytesIO(csv_buffer.getvalue().encode('utf-8')),
-        mimetype='text/csv',
-        as_attachment=True,
-        download_name=filename
-    )
+    return _csv_download(rows, filename)
 
 
 @api_bp.route('/export/features/csv')
 def export_features_csv():
     """Export feature comparison matrix as CSV."""
-    from .exporter import ReportExporter
-    
-    features = FeatureComparison.query.order_by(FeatureComparison.category, FeatureComparison.feature_name).all()
+    features = FeatureComparison.query.order_by(FeatureComparison.category, FeatureComparison.feature_name)
     competitors = Competitor.query.filter_by(is_active=True).order_by(Competitor.name).all()
     
-    data = []
-    for f in features:
-        row = {
-            'category': f.category,
-            'feature': f.feature_name,
-            'description': f.description or '',
-            'importance': f.customer_importance,
-            'our_capability': f.our_capability or '',
-            'our_details': f.our_details or ''
-        }
-        # Add competitor columns
-        comp_caps = json.loads(f.competitor_capabilities) if f.competitor_capabilities else {}
-        for c in competitors:
-            cap_data = comp_caps.get(str(c.id), {})
-            row[f'{c.name}_capability'] = cap_data.get('capability', '')
-            row[f'{c.name}_details'] = cap_data.get('details', '')
-        data.append(row)
-    
-    exporter = ReportExporter()
-    csv_buffer = exporter.export_csv(data)
+    def feature_rows():
+        for f in features:
+            row = {
+                'category': f.category,
+                'feature': f.feature_name,
+                'description': f.description or '',
+                'importance': f.customer_importance,
+                'our_capability': f.our_capability or '',
+                'our_details': f.our_details or ''
+            }
+            # Add competitor columns
+            comp_caps = f.get_competitor_capabilities()
+            for c in competitors:
+                cap_data = comp_caps.get(str(c.id), {})
+                row[f'{c.name}_capability'] = cap_data.get('capability', '')
+                row[f'{c.name}_details'] = cap_data.get('details', '')
+            yield row
     
     filename = f"feature_matrix_{datetime.now().strftime('%Y%m%d')}.csv"
-    return send_file(
-        io.BytesIO(csv_buffer.getvalue().encode('utf-8')),
-        mimetype='text/csv',
-        as_attachment=True,
-        download_name=filename
-    )
+    return _csv_download(feature_rows(), filename)
 
 
 # =============================================================================
@@ -2198,7 +2279,8 @@ def get_tracked_accounts():
     stage = request.args.get('stage')
     competitor_id = request.args.get('competitor_id', type=int)
     
-    query = TrackedAccount.query
+    # One IN query for every account's incumbent instead of one per to_dict()
+    query = TrackedAccount.query.options(selectinload(TrackedAccount.incumbent))
     if tier:
         query = query.filter_by(account_tier=tier)
     if stage:
@@ -2276,7 +2358,9 @@ def update_tracked_account(account_id):
 def get_account_activities(account_id):
     """Get activities for an account."""
     account = TrackedAccount.query.get_or_404(account_id)
-    activities = account.activities.order_by(AccountActivity.activity_date.desc()).limit(50).all()
+    activities = account.activities.options(
+        selectinload(AccountActivity.competitor)
+    ).order_by(AccountActivity.activity_date.desc()).limit(50).all()
     return jsonify([a.to_dict() for a in activities])
 
 
@@ -2397,7 +2481,7 @@ def get_feature_matrix():
             'importance': feature.customer_importance,
             'our_capability': feature.our_capability,
             'our_details': feature.our_details,
-            'competitors': json.loads(feature.competitor_capabilities) if feature.competitor_capabilities else {}
+            'competitors': feature.get_competitor_capabilities()
         }
         matrix['categories'][feature.category].append(feature_data)
     
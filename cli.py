@@ -95,6 +95,21 @@ def cmd_analyze(args):
     with app.app_context():
         analyzer = Analyzer()
         
+        if args.batch:
+            job = analyzer.submit_news_batch()
+            if job:
+                print(f"Submitted batch {job.batch_id} with {len(job.get_news_item_ids())} news items")
+            else:
+                print("No news items submitted.")
+            return
+        
+        if args.poll_batches:
+            results = analyzer.poll_news_batches()
+            print(f"\nBatches completed: {results['batches_completed']}")
+            print(f"  News items processed: {results['news_processed']}")
+            print(f"  Alerts created: {results['alerts_created']}")
+            return
+        
         print("Analyzing pending items...")
         results = analyzer.process_pending_items()
         
@@ -225,17 +240,18 @@ def cmd_notify(args):
 def cmd_competitors(args):
     """Manage competitors."""
     from app.database import Competitor, db
+    from sqlalchemy.orm import selectinload
     
     app = init_app()
     with app.app_context():
         if args.action == 'list':
-            competitors = Competitor.query.all()
+            competitors = Competitor.query.options(selectinload(Competitor.monitored_urls)).all()
             
             print(f"\n{len(competitors)} competitors:\n")
             
             for comp in competitors:
                 status = "✓ Active" if comp.is_active else "○ Inactive"
-                urls = comp.monitored_urls.count()
+                urls = len(comp.monitored_urls)
                 alerts = comp.alerts.filter_by(status='new').count()
                 
                 print(f"[{comp.id}] {comp.name}")
@@ -355,6 +371,8 @@ def main():
     
     # analyze command
     analyze_parser = subparsers.add_parser('analyze', help='Analyze pending items')
+    analyze_parser.add_argument('--batch', action='store_true', help='Submit news backlog as an OpenAI Batch API job')
+    analyze_parser.add_argument('--poll-batches', action='store_true', help='Collect results from finished batch jobs')
     analyze_parser.set_defaults(func=cmd_analyze)
     
     # alerts command
@@ -0,0 +1,13 @@
+"""
+Gunicorn configuration for Competitor Monitor.
+Picked up automatically when gunicorn is started from the project root.
+"""
+
+
+def post_fork(server, worker):
+    """Drop DB connections inherited from a preloaded parent process."""
+    if not server.cfg.preload_app:
+        return
+    
+    from app import dispose_engine
+    dispose_engine(server.app.wsgi())
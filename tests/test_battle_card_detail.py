@@ -0,0 +1,36 @@
+"""Render check for the battle card detail page."""
+import json
+import os
+import tempfile
+
+# Config is read at import, so point the app at a throwaway database first
+_DB_DIR = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ['DISABLE_SCHEDULER'] = 'true'
+
+from app import create_app  # noqa: E402
+from app.database import db, BattleCard, Competitor  # noqa: E402
+
+
+def test_battle_card_detail_renders_json_lists():
+    app = create_app()
+    with app.app_context():
+        competitor = Competitor(name='Hioki')
+        db.session.add(competitor)
+        db.session.flush()
+        card = BattleCard(
+            competitor_id=competitor.id,
+            name='Hioki battle card',
+            key_differentiators=json.dumps(['differentiator item']),
+            our_strengths=json.dumps(['strength item'])
+        )
+        db.session.add(card)
+        db.session.commit()
+        card_id = card.id
+    
+    response = app.test_client().get(f'/battle-cards/{card_id}')
+    
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    assert 'differentiator item' in html
+    assert 'strength item' in html